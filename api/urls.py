@@ -2,20 +2,40 @@ from django.contrib import admin
 from django.urls import include, path, re_path
 from rest_framework import routers
 
+from rest_api.async_views import (
+    ATTENDANCE_PARAMS,
+    LEAVE_REQUEST_PARAMS,
+    async_read,
+    attendance_detail,
+    attendance_list,
+    employee_detail,
+    leave_request_list,
+    monthly_report,
+)
 from rest_api.views import (
     AttendanceViewSet,
     EmployeeViewSet,
     LeaveRequestViewSet,
     LoginView,
     MonthlyAttendanceViewSet,
+    RefreshTokenView,
+    RevokeTokenView,
+    StatsView,
 )
 
 router = routers.DefaultRouter()
 
+# Views wired by hand below pass the @action kwargs (e.g. permission_classes)
+# to as_view() the same way a router would, so they are not silently dropped.
+# async_read() serves the busiest JSON reads on the event loop under ASGI.
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     path("api/login/", LoginView.as_view(), name="login"),
+    path("api/token/refresh/", RefreshTokenView.as_view(), name="token-refresh"),
+    path("api/token/revoke/", RevokeTokenView.as_view(), name="token-revoke"),
+    path("api/stats/", StatsView.as_view(), name="stats"),
     path(
         "api/employees/",
         EmployeeViewSet.as_view(
@@ -23,50 +43,133 @@ urlpatterns = [
         ),
         name="employee-list",
     ),
+    path(
+        "api/employees/import/",
+        EmployeeViewSet.as_view(
+            {"post": "bulk_import"}, **EmployeeViewSet.bulk_import.kwargs
+        ),
+        name="employee-import",
+    ),
     path(
         "api/employees/<str:employee_id>/",
-        EmployeeViewSet.as_view({"get": "retrieve"}),
+        async_read(EmployeeViewSet.as_view({"get": "retrieve"}), employee_detail),
         name="employee-detail",
     ),
+    path(
+        "api/employees/<str:employee_id>/ledger/",
+        EmployeeViewSet.as_view({"get": "ledger"}),
+        name="employee-ledger",
+    ),
+    path(
+        "api/employees/<str:employee_id>/balance/",
+        EmployeeViewSet.as_view({"get": "balance"}),
+        name="employee-balance",
+    ),
     path(
         "api/attendances/",
-        AttendanceViewSet.as_view({"get": "list", "post": "create"}),
+        async_read(
+            AttendanceViewSet.as_view({"get": "list", "post": "create"}),
+            attendance_list,
+            ATTENDANCE_PARAMS,
+        ),
         name="attendance-list",
     ),
+    path(
+        "api/attendances/bulk/",
+        AttendanceViewSet.as_view({"post": "bulk"}, **AttendanceViewSet.bulk.kwargs),
+        name="attendance-bulk",
+    ),
+    path(
+        "api/attendances/export/",
+        AttendanceViewSet.as_view({"get": "export"}),
+        name="attendance-export",
+    ),
+    path(
+        "api/attendances/heatmap/<int:year>/",
+        MonthlyAttendanceViewSet.as_view({"get": "heatmap"}),
+        name="attendance-heatmap",
+    ),
+    path(
+        "api/attendances/range/",
+        MonthlyAttendanceViewSet.as_view({"get": "date_range"}),
+        name="attendance-range",
+    ),
     re_path(
         r"^api/attendances/(?P<date>\d{4}-\d{2}-\d{2})/$",
-        AttendanceViewSet.as_view(
-            {
-                "get": "list",
-            }
+        async_read(
+            AttendanceViewSet.as_view(
+                {
+                    "get": "list",
+                }
+            ),
+            attendance_list,
+            ATTENDANCE_PARAMS,
         ),
         name="attendance-list-by-date",
     ),
     re_path(
         r"^api/attendances/(?P<date>\d{4}-\d{2}-\d{2})/(?P<employee_id>.+)/$",
-        AttendanceViewSet.as_view(
-            {"get": "retrieve", "patch": "partial_update", "delete": "destroy"}
+        async_read(
+            AttendanceViewSet.as_view(
+                {"get": "retrieve", "patch": "partial_update", "delete": "destroy"}
+            ),
+            attendance_detail,
         ),
         name="attendance-detail",
     ),
     re_path(
         r"^api/attendances/(?P<month>\d{4}-\d{2})/$",
-        MonthlyAttendanceViewSet.as_view({"get": "list"}),
+        async_read(MonthlyAttendanceViewSet.as_view({"get": "list"}), monthly_report),
+    ),
+    re_path(
+        r"^api/attendances/(?P<month>\d{4}-\d{2})/summary/$",
+        MonthlyAttendanceViewSet.as_view({"get": "summary"}),
+        name="attendance-monthly-summary",
     ),
     re_path(
         r"^api/attendances/(?P<month>\d{4}-\d{2})/(?P<employee_id>.+)/$",
-        MonthlyAttendanceViewSet.as_view({"get": "list"}),
+        async_read(MonthlyAttendanceViewSet.as_view({"get": "list"}), monthly_report),
     ),
     path(
         "api/leave-requests/",
-        LeaveRequestViewSet.as_view(
-            {
-                "get": "list",
-                "post": "create",
-            }
+        async_read(
+            LeaveRequestViewSet.as_view(
+                {
+                    "get": "list",
+                    "post": "create",
+                }
+            ),
+            leave_request_list,
+            LEAVE_REQUEST_PARAMS,
         ),
         name="leave-request-list",
     ),
+    path(
+        "api/leave-requests/export/",
+        LeaveRequestViewSet.as_view({"get": "export"}),
+        name="leave-request-export",
+    ),
+    path(
+        "api/leave-requests/bulk-decision/",
+        LeaveRequestViewSet.as_view(
+            {"post": "bulk_decision"}, **LeaveRequestViewSet.bulk_decision.kwargs
+        ),
+        name="leave-request-bulk-decision",
+    ),
+    path(
+        "api/leave-requests/queue/",
+        LeaveRequestViewSet.as_view(
+            {"get": "queue"}, **LeaveRequestViewSet.queue.kwargs
+        ),
+        name="leave-request-queue",
+    ),
+    path(
+        "api/leave-requests/queue/events/",
+        LeaveRequestViewSet.as_view(
+            {"get": "queue_events"}, **LeaveRequestViewSet.queue_events.kwargs
+        ),
+        name="leave-request-queue-events",
+    ),
     path(
         "api/leave-requests/<int:uuid>/",
         LeaveRequestViewSet.as_view(
@@ -79,7 +182,8 @@ urlpatterns = [
         LeaveRequestViewSet.as_view(
             {
                 "post": "approve",
-            }
+            },
+            **LeaveRequestViewSet.approve.kwargs,
         ),
         name="leave-request-approve",
     ),
@@ -88,7 +192,8 @@ urlpatterns = [
         LeaveRequestViewSet.as_view(
             {
                 "post": "deny",
-            }
+            },
+            **LeaveRequestViewSet.deny.kwargs,
         ),
         name="leave-request-deny",
     ),
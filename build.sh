@@ -7,4 +7,6 @@ python manage.py collectstatic --no-input
 
 python manage.py migrate
 
+python manage.py createcachetable
+
 python manage.py createsuperuser --no-input --employee_type "PRIVILEGED" --first_name "Ahmed" --last_name "Shahir"
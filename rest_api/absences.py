@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Attendance, Employee
+from .rollups import refresh_attendance_months
+
+MATERIALIZE_ABSENCES_SQL = f"""
+    INSERT INTO {Attendance._meta.db_table} (employee_id, date, status, updated_at)
+    SELECT employee.id, day::date, %(status)s, %(updated_at)s
+    FROM {Employee._meta.db_table} AS employee
+    CROSS JOIN generate_series(
+        %(start_date)s::date, %(end_date)s::date, interval '1 day'
+    ) AS day
+    WHERE employee.is_active
+        AND day::date >= (employee.date_joined AT TIME ZONE %(time_zone)s)::date
+    ON CONFLICT (employee_id, date) DO NOTHING
+    RETURNING employee_id, date
+"""
+
+
+def materialize_absences(start_date, end_date):
+    """
+    Insert an ``ABSENT`` row for every active employee without attendance
+    on each day in ``[start_date, end_date]``, skipping days before they
+    joined. Runs as a single ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``
+    and returns the number of rows inserted.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            MATERIALIZE_ABSENCES_SQL,
+            {
+                "status": Attendance.Status.ABSENT.value,
+                "start_date": start_date,
+                "end_date": end_date,
+                "time_zone": settings.TIME_ZONE,
+                "updated_at": timezone.now(),
+            },
+        )
+        inserted = cursor.fetchall()
+        # The raw INSERT bypasses the signals that keep rollups current
+        refresh_attendance_months(inserted)
+
+    return len(inserted)
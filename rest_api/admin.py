@@ -1,6 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-from .models import Attendance, Employee, LeaveRequest
+from .ledger import LedgerError, reverse_entry
+from .models import Attendance, Employee, LeaveLedgerEntry, LeaveRequest
 
 
 class EmployeeAdmin(admin.ModelAdmin):
@@ -46,6 +47,48 @@ class LeaveRequestAdmin(admin.ModelAdmin):
         return attendance.employee.employee_id if attendance.employee else "N/A"
 
 
+class LeaveLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "employee_id",
+        "name",
+        "kind",
+        "amount",
+        "balance",
+        "leave_request",
+        "note",
+    )
+    list_filter = ("kind",)
+    actions = ["reverse_entries"]
+
+    def name(self, entry):
+        return entry.employee.get_full_name() if entry.employee else "N/A"
+
+    def employee_id(self, entry):
+        return entry.employee.employee_id if entry.employee else "N/A"
+
+    # The ledger is append-only; mistakes are corrected by reversing them
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Reverse selected entries")
+    def reverse_entries(self, request, queryset):
+        for entry in queryset.order_by("id"):
+            try:
+                reverse_entry(entry)
+            except LedgerError as error:
+                self.message_user(
+                    request, f"Entry #{entry.pk}: {error}", messages.ERROR
+                )
+
+
 admin.site.register(Employee, EmployeeAdmin)
 admin.site.register(Attendance, AttendanceAdmin)
 admin.site.register(LeaveRequest, LeaveRequestAdmin)
+admin.site.register(LeaveLedgerEntry, LeaveLedgerEntryAdmin)
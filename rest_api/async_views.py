@@ -0,0 +1,262 @@
+import math
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .authentication import aauthenticate
+from .conditional import add_validators, aversion_stamp, validators
+from .fieldsets import load_fields, sparse_kwargs
+from .models import Attendance, Employee
+from .reports import (
+    annotate_monthly_counts,
+    month_range,
+    month_report,
+    previous_month_range,
+    report_sources,
+)
+from .views import AttendanceViewSet, EmployeeViewSet, LeaveRequestViewSet
+
+SPARSE_PARAMS = ("fields", "expand")
+PAGE_PARAM = "page"
+ATTENDANCE_PARAMS = (PAGE_PARAM, *AttendanceViewSet.filterset_class.base_filters)
+LEAVE_REQUEST_PARAMS = (PAGE_PARAM, *LeaveRequestViewSet.filterset_class.base_filters)
+
+
+class Fallback(Exception):
+    """
+    Raised by an async handler to leave the request to the DRF view, e.g.
+    for anything but a successful response.
+    """
+
+
+def async_read(view, handler, params=()):
+    """
+    Serve ``view``'s JSON GETs with the coroutine ``handler`` on the event
+    loop, without a thread per request.
+
+    Only token-authenticated GETs whose query string holds nothing but
+    ``?fields=``, ``?expand=`` and ``params`` reach the handler, which
+    returns the response or raises ``Fallback``. Everything else, including
+    every error response, is left to the DRF view, so both paths answer
+    alike. Disabled with the ``ASYNC_READS`` setting.
+    """
+    if not getattr(settings, "ASYNC_READS", True):
+        return view
+    allowed = {*SPARSE_PARAMS, *params}
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if (
+            request.method == "GET"
+            and allowed.issuperset(request.GET)
+            and "text/html" not in request.headers.get("Accept", "")
+        ):
+            user = await aauthenticate(request)
+            if user is not None:
+                try:
+                    response = await handler(request, user, *args, **kwargs)
+                except Fallback:
+                    pass
+                else:
+                    patch_vary_headers(response, ["Accept"])
+                    return response
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    return async_view
+
+
+def _is_general(user):
+    return user.employee_type == Employee.Type.GENERAL
+
+
+def _scope(queryset, user, owner_field):
+    if _is_general(user):
+        queryset = queryset.filter(**{owner_field: user.pk})
+    return queryset
+
+
+def _check_owner(user, employee_id):
+    # The DRF view answers general users asking for others with a 403
+    if employee_id is not None and _is_general(user):
+        if employee_id != user.employee_id:
+            raise Fallback
+
+
+def _json(data):
+    return HttpResponse(JSONRenderer().render(data), content_type="application/json")
+
+
+async def _respond(
+    request, user, render, *querysets, extra=(), single=False, related=()
+):
+    """
+    Answer with 304 Not Modified when the client's copy of the stamped rows
+    is current, else with the JSON of ``await render()``.
+    """
+    stamps = await aversion_stamp(*querysets, related=related)
+    etag, last_modified = validators(user, "json", stamps, extra, single)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _json(await render())
+    return add_validators(response, etag, last_modified)
+
+
+async def _paginate(request, queryset, page_size):
+    """
+    Return a page of ``queryset`` in ``PageNumberPagination``'s format,
+    without its results.
+    """
+    count = await queryset.acount()
+    num_pages = max(math.ceil(count / page_size), 1)
+    page = request.GET.get(PAGE_PARAM, "1")
+    try:
+        number = num_pages if page == "last" else int(page)
+    except ValueError:
+        raise Fallback
+    if not 1 <= number <= num_pages:
+        raise Fallback
+
+    offset = (number - 1) * page_size
+    results = [obj async for obj in queryset[offset : offset + page_size]]
+    url = request.build_absolute_uri()
+    previous = None
+    if number == 2:
+        previous = remove_query_param(url, PAGE_PARAM)
+    elif number > 2:
+        previous = replace_query_param(url, PAGE_PARAM, number - 1)
+    page = {
+        "count": count,
+        "next": (
+            replace_query_param(url, PAGE_PARAM, number + 1)
+            if number < num_pages
+            else None
+        ),
+        "previous": previous,
+    }
+    return page, results
+
+
+async def _list(request, user, viewset, queryset):
+    filterset = viewset.filterset_class(request.GET, queryset=queryset)
+    if not filterset.is_valid():
+        raise Fallback
+    queryset = filterset.qs
+    serializer_class = viewset.serializer_class
+    kwargs = sparse_kwargs(request.GET)
+
+    async def render():
+        rows = load_fields(
+            queryset, serializer_class(**kwargs), viewset.keyset_ordering
+        )
+        page, results = await _paginate(
+            request, rows, viewset.pagination_class.page_size
+        )
+        page["results"] = serializer_class(results, many=True, **kwargs).data
+        return page
+
+    return await _respond(
+        request, user, render, queryset, related=viewset.stamp_related
+    )
+
+
+async def _detail(request, user, viewset, queryset):
+    serializer_class = viewset.serializer_class
+    kwargs = sparse_kwargs(request.GET)
+
+    async def render():
+        instance = await load_fields(
+            queryset, serializer_class(**kwargs), viewset.keyset_ordering
+        ).afirst()
+        if instance is None:
+            raise Fallback
+        return serializer_class(instance, **kwargs).data
+
+    return await _respond(
+        request, user, render, queryset, single=True, related=viewset.stamp_related
+    )
+
+
+def _parse_date(value, format="%Y-%m-%d"):
+    try:
+        return datetime.strptime(value, format).date()
+    except ValueError:
+        raise Fallback
+
+
+async def employee_detail(request, user, employee_id):
+    _check_owner(user, employee_id)
+    employees = _scope(
+        EmployeeViewSet.queryset.filter(employee_id=employee_id),
+        user,
+        EmployeeViewSet.owner_field,
+    )
+    return await _detail(request, user, EmployeeViewSet, employees)
+
+
+async def attendance_list(request, user, date=None):
+    attendances = _scope(
+        AttendanceViewSet.queryset.all(), user, AttendanceViewSet.owner_field
+    )
+    if date is not None:
+        attendances = attendances.filter(date=_parse_date(date))
+    return await _list(request, user, AttendanceViewSet, attendances)
+
+
+async def attendance_detail(request, user, date, employee_id):
+    _check_owner(user, employee_id)
+    attendances = _scope(
+        AttendanceViewSet.queryset.filter(
+            date=_parse_date(date), employee__employee_id=employee_id
+        ),
+        user,
+        AttendanceViewSet.owner_field,
+    )
+    return await _detail(request, user, AttendanceViewSet, attendances)
+
+
+async def monthly_report(request, user, month, employee_id=None):
+    _check_owner(user, employee_id)
+    employee_id = employee_id or user.employee_id
+    start_date, end_date = month_range(_parse_date(month + "-01"))
+    today = timezone.localdate()
+    employees = Employee.objects.filter(employee_id=employee_id)
+
+    async def render():
+        employee = await annotate_monthly_counts(
+            employees, start_date, end_date, today
+        ).afirst()
+        if employee is None:
+            raise Fallback
+        logs = _scope(
+            Attendance.objects.filter(
+                employee__employee_id=employee_id,
+                date__range=(start_date, end_date),
+            ),
+            user,
+            "employee",
+        )
+        logs = [log async for log in logs]
+        return month_report(employee, logs, start_date, end_date, today)
+
+    # Days up to today count as absent, so reports also change daily
+    return await _respond(
+        request,
+        user,
+        render,
+        *report_sources(employees, previous_month_range(start_date)[0], end_date),
+        extra=[timezone.localdate()],
+    )
+
+
+async def leave_request_list(request, user):
+    leave_requests = _scope(
+        LeaveRequestViewSet.queryset.all(), user, LeaveRequestViewSet.owner_field
+    )
+    return await _list(request, user, LeaveRequestViewSet, leave_requests)
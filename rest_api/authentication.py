@@ -0,0 +1,278 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .events import RESYNC, auth_events
+from .models import Employee
+from .tokens import InvalidToken, read_access_token, revocations
+
+# Everything authentication and permission checks read from request.user;
+# any other field is loaded from the database on first access
+SNAPSHOT_FIELDS = (
+    "id",
+    "employee_id",
+    "employee_type",
+    "first_name",
+    "last_name",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+# Employee fields carried by signed access tokens, by claim
+CLAIMS = {"id": "sub", "employee_id": "eid", "employee_type": "typ"}
+
+# Model.from_db() takes partial rows in concrete field order
+SNAPSHOT_ATTNAMES = [
+    field.attname
+    for field in Employee._meta.concrete_fields
+    if field.attname in SNAPSHOT_FIELDS
+]
+CLAIM_ATTNAMES = [
+    field.attname for field in Employee._meta.concrete_fields if field.attname in CLAIMS
+]
+
+
+class TokenCache:
+    """
+    Per-process LRU cache of token key -> employee snapshot, with entries
+    expiring after ``ttl`` seconds.
+
+    Each request gets its own ``Employee`` instance built from the cached
+    values, so nothing mutable is shared between requests.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.keys_by_user = {}
+        self.lock = threading.Lock()
+        # Bumped by every invalidation, so a lookup that raced one isn't
+        # cached
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            values = entry[1]
+        return Employee.from_db(Employee.objects.db, SNAPSHOT_ATTNAMES, values)
+
+    def set(self, key, user, version):
+        values = tuple(getattr(user, field) for field in SNAPSHOT_ATTNAMES)
+        with self.lock:
+            if version != self.version:
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, values)
+            self.entries.move_to_end(key)
+            self.keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, values = self.entries.pop(key)
+        keys = self.keys_by_user.get(values[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_user[values[0]]
+
+    def discard_users(self, user_pks):
+        with self.lock:
+            self.version += 1
+            for user_pk in user_pks:
+                for key in self.keys_by_user.pop(user_pk, ()):
+                    self.entries.pop(key, None)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.version += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.keys_by_user.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+token_cache = TokenCache(
+    getattr(settings, "TOKEN_CACHE_SIZE", 10000),
+    getattr(settings, "TOKEN_CACHE_TTL", 60),
+)
+
+
+def _receive_invalidations(events):
+    if events == RESYNC:
+        token_cache.clear()
+        revocations.reset()
+        return
+    token_cache.discard_users(
+        event["user"] for event in events if event["event"] == "invalidate"
+    )
+    for event in events:
+        if event["event"] == "revoke":
+            revocations.add(
+                event["user"], event["revoked"], event["expires"], event["jti"]
+            )
+
+
+def _connect():
+    if not auth_events.receivers:
+        auth_events.connect(_receive_invalidations)
+
+
+def invalidate_cached_tokens(user_pk):
+    """
+    Drop ``user_pk``'s cached tokens in every worker once the current
+    transaction commits.
+    """
+    # This worker forgets them straight away, the others when notified
+    transaction.on_commit(lambda: token_cache.discard_users([user_pk]))
+    auth_events.publish([{"event": "invalidate", "user": user_pk}])
+
+
+def user_from_claims(claims):
+    """
+    Build the employee an access token's claims describe, without a query.
+    """
+    user = Employee.from_db(
+        Employee.objects.db,
+        CLAIM_ATTNAMES,
+        [claims[CLAIMS[attname]] for attname in CLAIM_ATTNAMES],
+    )
+    # Deactivating an employee revokes their tokens
+    user.is_active = True
+    return user
+
+
+async def aauthenticate(request):
+    """
+    Authenticate a plain Django request's ``Token`` or ``Bearer`` header
+    for async views, sharing the token cache and revocation list with the
+    authentication classes below. Returns ``None`` for a missing, invalid
+    or other kind of credential, which is left to DRF to authenticate or
+    reject.
+    """
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2:
+        return None
+    try:
+        credential = auth[1].decode()
+    except UnicodeError:
+        return None
+
+    _connect()
+    keyword = auth[0].lower()
+    if keyword == CachedTokenAuthentication.keyword.lower().encode():
+        version = token_cache.version
+        user = token_cache.get(credential)
+        if user is None:
+            token = (
+                await Token.objects.select_related("user")
+                .filter(key=credential)
+                .afirst()
+            )
+            if token is None or not token.user.is_active:
+                return None
+            user = token.user
+            token_cache.set(credential, user, version)
+        return user
+
+    if (
+        keyword == SignedTokenAuthentication.keyword.lower().encode()
+        and settings.AUTH_TOKEN_MODE == "signed"
+    ):
+        if not revocations.loaded:
+            await sync_to_async(revocations.load)()
+        try:
+            return user_from_claims(read_access_token(credential))
+        except InvalidToken:
+            return None
+    return None
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that skips the token/employee query for tokens
+    seen within the last ``TOKEN_CACHE_TTL`` seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        _connect()
+
+        version = token_cache.version
+        user = token_cache.get(key)
+        if user is not None:
+            return user, self.get_model()(key=key, user_id=user.pk)
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, version)
+        return user, token
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates ``Authorization: Bearer <access token>`` from the token's
+    signature and claims alone, without querying the database. The
+    employee carries the claimed ``employee_id`` and ``employee_type``;
+    any other field is loaded on first access.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid bearer header.")
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid bearer header.")
+
+        _connect()
+        try:
+            claims = read_access_token(token)
+        except InvalidToken as error:
+            raise AuthenticationFailed(str(error))
+
+        return user_from_claims(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+import numpy as np
+
+from .models import Attendance, AttendanceMonth
+
+# Each AttendanceMonth.days blob holds a 3 bit status code for each of the
+# (up to) 31 days of the month, least significant bits first. Code 0 means
+# there is no Attendance row for that day.
+DAYS_PER_MONTH = 31
+BITS_PER_DAY = 3
+BYTES_PER_MONTH = (DAYS_PER_MONTH * BITS_PER_DAY + 7) // 8
+
+NO_RECORD = 0
+STATUS_CODES = {
+    Attendance.Status.PRESENT: 1,
+    Attendance.Status.LATE: 2,
+    Attendance.Status.ABSENT: 3,
+    Attendance.Status.ON_LEAVE: 4,
+}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+_BIT_WEIGHTS = np.array([1 << bit for bit in range(BITS_PER_DAY)], dtype=np.uint8)
+
+
+def encode_month(day_statuses):
+    """
+    Pack a ``{day_of_month: status}`` mapping into a month bitmap.
+    """
+    packed = 0
+    for day, status in day_statuses.items():
+        packed |= STATUS_CODES[status] << ((day - 1) * BITS_PER_DAY)
+    return packed.to_bytes(BYTES_PER_MONTH, "little")
+
+
+def decode_months(blobs):
+    """
+    Decode a sequence of month bitmaps into a ``(len(blobs), 31)`` array of
+    status codes in one vectorized pass.
+    """
+    if not blobs:
+        return np.zeros((0, DAYS_PER_MONTH), dtype=np.uint8)
+
+    raw = np.frombuffer(b"".join(bytes(blob) for blob in blobs), dtype=np.uint8)
+    bits = np.unpackbits(
+        raw.reshape(len(blobs), BYTES_PER_MONTH), axis=1, bitorder="little"
+    )
+    bits = bits[:, : DAYS_PER_MONTH * BITS_PER_DAY].reshape(
+        len(blobs), DAYS_PER_MONTH, BITS_PER_DAY
+    )
+    return bits @ _BIT_WEIGHTS
+
+
+def _month_starts(start_date, end_date):
+    month = start_date.replace(day=1)
+    while month <= end_date:
+        yield month
+        month = (month + timedelta(days=DAYS_PER_MONTH + 1)).replace(day=1)
+
+
+def load_attendance_grid(employee_pks, start_date, end_date):
+    """
+    Load the status codes of many employees over ``[start_date, end_date]``.
+
+    Returns ``(employee_pks, grid)`` where ``grid`` is a
+    ``(len(employee_pks), days)`` ``uint8`` array of status codes, with
+    rows in the order of the returned primary keys. Days without a record
+    are ``NO_RECORD``.
+    """
+    employee_pks = list(employee_pks)
+    row_of = {employee_pk: row for row, employee_pk in enumerate(employee_pks)}
+    num_days = (end_date - start_date).days + 1
+    grid = np.zeros((len(employee_pks), num_days), dtype=np.uint8)
+
+    months = list(_month_starts(start_date, end_date))
+    records = list(
+        AttendanceMonth.objects.filter(
+            employee_id__in=employee_pks, month__in=months
+        ).values_list("employee_id", "month", "days")
+    )
+    if not records:
+        return employee_pks, grid
+
+    decoded = decode_months([days for _, _, days in records])
+    rows = np.array([row_of[employee_pk] for employee_pk, _, _ in records])
+    record_months = np.array([month for _, month, _ in records])
+
+    # Copy one calendar month at a time for every employee at once
+    for month in months:
+        selected = record_months == month
+        if not selected.any():
+            continue
+        first = max(month, start_date)
+        next_month = (month + timedelta(days=DAYS_PER_MONTH + 1)).replace(day=1)
+        last = min(next_month - timedelta(days=1), end_date)
+        offset = (first - start_date).days
+        span = (last - first).days + 1
+        grid[rows[selected], offset : offset + span] = decoded[
+            selected, first.day - 1 : first.day - 1 + span
+        ]
+
+    return employee_pks, grid
@@ -0,0 +1,122 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def _stamp(related):
+    stamp = {"rows": Count("pk"), "updated_at": Max("updated_at")}
+    for name in related:
+        stamp[f"{name}_rows"] = Count(name)
+        stamp[f"{name}_updated_at"] = Max(f"{name}__updated_at")
+    return stamp
+
+
+def version_stamp(*querysets, related=()):
+    """
+    Summarize each queryset's rows as their count and latest ``updated_at``,
+    one aggregate query each. Inserting, updating or deleting any of the
+    rows changes the stamp, and so does changing a row of a ``related``
+    relation rendered along with them.
+    """
+    stamp = _stamp(related)
+    return [queryset.order_by().aggregate(**stamp) for queryset in querysets]
+
+
+async def aversion_stamp(*querysets, related=()):
+    stamp = _stamp(related)
+    return [await queryset.order_by().aaggregate(**stamp) for queryset in querysets]
+
+
+def validators(user, format, stamps, extra=(), single=False):
+    """
+    Return the ETag and ``Last-Modified`` timestamp (single rows only, else
+    ``None``) of ``user``'s response in ``format`` built from the stamped
+    rows.
+    """
+    payload = [user.pk, format, extra, stamps]
+    digest = hashlib.md5(
+        json.dumps(payload, cls=DjangoJSONEncoder).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    last_modified = None
+    if single:
+        updated = [
+            value
+            for name, value in stamps[0].items()
+            if name.endswith("updated_at") and value is not None
+        ]
+        if updated:
+            last_modified = int(max(updated).timestamp())
+    return quote_etag(digest), last_modified
+
+
+def add_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # Responses differ per user, and clients should revalidate
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin that answers ``If-None-Match`` with 304 Not Modified from
+    a version stamp of the rows a response is built from, before anything
+    is serialized.
+
+    ``list`` and ``retrieve`` stamp the filtered queryset; other actions
+    call ``not_modified()`` with the querysets they read. ``Last-Modified``
+    is only sent for single rows, since a deletion never moves the latest
+    ``updated_at`` of a set forward. Relations the responses render are
+    listed in ``stamp_related`` so that changes to them count too.
+    """
+
+    stamp_related = ()
+
+    def not_modified(self, request, *querysets, extra=(), single=False, related=()):
+        """
+        Return a 304 response if the client's copy is current, else
+        ``None``; either way the ETag is added to the final response.
+        """
+        self.etag, self.last_modified = validators(
+            request.user,
+            request.accepted_renderer.format,
+            version_stamp(*querysets, related=related),
+            extra,
+            single,
+        )
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())  # pyright: ignore
+        not_modified = self.not_modified(request, queryset, related=self.stamp_related)
+        return not_modified or super().list(request, *args, **kwargs)  # pyright: ignore
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())  # pyright: ignore
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field  # pyright: ignore
+        if lookup_url_kwarg in self.kwargs:  # pyright: ignore
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}  # pyright: ignore
+            )
+        not_modified = self.not_modified(
+            request, queryset, single=True, related=self.stamp_related
+        )
+        return not_modified or super().retrieve(request, *args, **kwargs)  # pyright: ignore
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(  # pyright: ignore
+            request, response, *args, **kwargs
+        )
+        etag = getattr(self, "etag", None)
+        if etag:
+            add_validators(response, etag, self.last_modified)
+        return response
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL caps NOTIFY payloads at 8000 bytes
+NOTIFY_BATCH_SIZE = 100
+SUBSCRIBER_QUEUE_SIZE = 100
+KEEPALIVE_SECONDS = 15
+RECONNECT_SECONDS = 1
+RETRY_MILLISECONDS = 5000
+
+# Sent when events may have been missed and clients should reload
+RESYNC = [{"event": "resync"}]
+
+
+def _message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def _offer(queue, events):
+    try:
+        queue.put_nowait(events)
+    except asyncio.QueueFull:
+        # The client fell behind, so replace its backlog with a resync
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+
+class Broadcaster:
+    """
+    Fans events published on a channel out to the event streams open in
+    this process.
+
+    On PostgreSQL events are sent with ``NOTIFY``, so they are delivered
+    only once the publishing transaction commits and reach every worker
+    process; each process keeps a single ``LISTEN`` connection, opened by
+    its first subscriber or receiver. Other databases dispatch in-process
+    on commit.
+    """
+
+    def __init__(self, channel, using="default"):
+        self.channel = channel
+        self.using = using
+        self.subscribers = {}
+        self.receivers = []
+        self.lock = threading.Lock()
+        self.listener = None
+
+    def publish(self, events):
+        events = list(events)
+        if not events:
+            return
+        connection = connections[self.using]
+        if connection.vendor != "postgresql":
+            transaction.on_commit(lambda: self.dispatch(events), using=self.using)
+            return
+        with connection.cursor() as cursor:
+            for start in range(0, len(events), NOTIFY_BATCH_SIZE):
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [
+                        self.channel,
+                        json.dumps(
+                            events[start : start + NOTIFY_BATCH_SIZE],
+                            cls=DjangoJSONEncoder,
+                        ),
+                    ],
+                )
+
+    def start_listener(self):
+        # Callers hold self.lock
+        if self.listener is None and connections[self.using].vendor == "postgresql":
+            self.listener = threading.Thread(
+                target=self.listen, name=f"listen-{self.channel}", daemon=True
+            )
+            self.listener.start()
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers[queue] = asyncio.get_running_loop()
+            self.start_listener()
+        return queue
+
+    def connect(self, receiver):
+        """
+        Call ``receiver(events)`` with every batch of events, from the
+        listener thread on PostgreSQL and on commit elsewhere.
+        """
+        with self.lock:
+            if receiver not in self.receivers:
+                self.receivers.append(receiver)
+            self.start_listener()
+
+    def unsubscribe(self, queue):
+        with self.lock:
+            self.subscribers.pop(queue, None)
+
+    def dispatch(self, events):
+        with self.lock:
+            subscribers = list(self.subscribers.items())
+            receivers = list(self.receivers)
+        for receiver in receivers:
+            try:
+                receiver(events)
+            except Exception:
+                logger.exception("Receiver of %s events failed", self.channel)
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, events)
+            except RuntimeError:
+                # The subscriber's event loop has been closed
+                self.unsubscribe(queue)
+
+    def listen(self):
+        while True:
+            try:
+                self.receive()
+            except Exception:
+                logger.exception("Lost the %s listener connection", self.channel)
+            self.dispatch(RESYNC)
+            time.sleep(RECONNECT_SECONDS)
+
+    def receive(self):
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        database = connections[self.using]
+        # Connect directly, since a listener would hold a pooled connection
+        # for good
+        connection = database.Database.connect(**database.get_connection_params())
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                if is_psycopg3:
+                    notifies = list(
+                        connection.notifies(timeout=KEEPALIVE_SECONDS, stop_after=1)
+                    )
+                else:
+                    readable, _, _ = select.select(
+                        [connection], [], [], KEEPALIVE_SECONDS
+                    )
+                    if not readable:
+                        continue
+                    connection.poll()
+                    notifies, connection.notifies[:] = connection.notifies[:], []
+                events = []
+                for notify in notifies:
+                    events.extend(json.loads(notify.payload))
+                if events:
+                    self.dispatch(events)
+        finally:
+            connection.close()
+
+    async def stream(self):
+        queue = self.subscribe()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            yield _message("ready", {})
+            while True:
+                try:
+                    events = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _message(self.channel, events)
+        finally:
+            self.unsubscribe(queue)
+
+
+leave_request_events = Broadcaster("leave_requests")
+auth_events = Broadcaster("auth_invalidations")
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Streams bypass rendering, so this only ever renders errors
+        return _message("error", data)
+
+
+def event_stream_response(request, broadcaster):
+    """
+    Stream ``broadcaster``'s events as Server-Sent Events. An idle stream
+    costs one waiting task and a keepalive comment every few seconds.
+    """
+    if isinstance(request._request, ASGIRequest):
+        stream = broadcaster.stream()
+    else:
+        # A WSGI worker can't be held open, so let the client reconnect
+        stream = iter([f"retry: {RETRY_MILLISECONDS}\n\n", _message("ready", {})])
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,169 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_fields(value):
+    """
+    Parse ``"uuid,employee.employee_id"`` into ``{"uuid": {}, "employee":
+    {"employee_id": {}}}``. An empty selection means "every field".
+    """
+    fieldset = {}
+    for path in value.split(","):
+        names = [name for name in path.strip().split(".") if name]
+        selection = fieldset
+        for name in names:
+            selection = selection.setdefault(name, {})
+    return fieldset
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin accepting ``fields`` and ``expand`` keyword arguments.
+
+    ``fields`` is a selection as returned by ``parse_fields``; fields it
+    doesn't name are dropped. Relations listed in ``Meta.expandable_fields``
+    (a ``{field: slug_field}`` mapping) are nested unless ``expand`` is
+    given without naming them, in which case they are rendered as their
+    slug. Selecting nested fields of a relation implies expanding it;
+    unknown or write-only names are ignored, so a selection naming no field
+    it renders leaves the relation as if only its name was selected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fieldset = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        if fieldset:
+            for name in set(self.fields) - set(fieldset):
+                self.fields.pop(name)
+
+        expandable = getattr(self.Meta, "expandable_fields", {})  # pyright: ignore
+        for name, slug_field in expandable.items():
+            if name not in self.fields:
+                continue
+            field = self.fields[name]
+            nested = (fieldset or {}).get(name)
+            if nested:
+                selected = type(field)(*field._args, **field._kwargs, fields=nested)
+                if any(not child.write_only for child in selected.fields.values()):
+                    self.fields[name] = selected
+                    continue
+            if expand is not None and name not in expand:
+                self.fields[name] = serializers.SlugRelatedField(
+                    slug_field=slug_field,
+                    read_only=True,
+                    source=field._kwargs.get("source"),
+                )
+
+
+def _load_paths(serializer, prefix=""):
+    """
+    Return the ``select_related()`` and ``only()`` arguments needed to
+    render ``serializer`` without further queries. The ``only()`` list is
+    ``None`` when a field isn't backed by a concrete model field.
+    """
+    model = serializer.Meta.model
+    related, only = [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            only = None
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            only = None
+            continue
+
+        path = f"{prefix}{model_field.name}"
+        if isinstance(field, serializers.BaseSerializer):
+            related.append(path)
+            nested_related, nested_only = _load_paths(field, f"{path}__")
+            related.extend(nested_related)
+            if only is not None and nested_only is not None:
+                # A relation can't be both deferred and selected
+                pk_name = field.Meta.model._meta.pk.name
+                only.extend([f"{path}__{pk_name}", *nested_only])
+            else:
+                only = None
+        elif isinstance(field, serializers.SlugRelatedField):
+            related.append(path)
+            if only is not None:
+                only.append(f"{path}__{field.slug_field}")
+        elif only is not None:
+            only.append(path)
+    return related, only
+
+
+def sparse_kwargs(query_params, fields_param="fields", expand_param="expand"):
+    """
+    Return the ``fields`` and ``expand`` serializer keyword arguments asked
+    for in ``query_params``.
+    """
+    kwargs = {}
+    fields = query_params.get(fields_param)
+    if fields:
+        kwargs["fields"] = parse_fields(fields)
+    if expand_param in query_params:
+        expand = query_params.get(expand_param)
+        kwargs["expand"] = set(filter(None, expand.split(",")))
+    return kwargs
+
+
+def load_fields(queryset, serializer, extra=()):
+    """
+    Narrow ``queryset`` to what ``serializer`` renders, plus the ``extra``
+    fields, with ``select_related()`` and ``only()``.
+    """
+    related, only = _load_paths(serializer)
+    if related:
+        queryset = queryset.select_related(*related)
+    if only is not None:
+        queryset = queryset.only(*only, *extra)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin wiring ``?fields=`` and ``?expand=`` into serializers that
+    use ``SparseFieldsetSerializerMixin``, and loading exactly what the
+    chosen fields render with ``select_related()``/``only()`` so a list
+    costs a constant number of queries. Writes always use every field.
+    """
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def is_sparse(self):
+        request = getattr(self, "request", None)
+        return (
+            request is not None
+            and request.method in SAFE_METHODS
+            and issubclass(
+                self.get_serializer_class(),  # pyright: ignore
+                SparseFieldsetSerializerMixin,
+            )
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_sparse():
+            sparse = sparse_kwargs(
+                self.request.query_params,  # pyright: ignore
+                self.fields_query_param,
+                self.expand_query_param,
+            )
+            kwargs = {**sparse, **kwargs}
+        return super().get_serializer(*args, **kwargs)  # pyright: ignore
+
+    def get_queryset(self):
+        queryset = super().get_queryset()  # pyright: ignore
+        if not self.is_sparse():
+            return queryset
+
+        # Keyset cursors are built from the loaded instances
+        return load_fields(
+            queryset, self.get_serializer(), getattr(self, "keyset_ordering", ())
+        )
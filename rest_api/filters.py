@@ -1,27 +1,28 @@
 import django_filters
-from django.db.models import Value
-from django.db.models.functions import Concat
 
 from .models import Attendance, Employee, LeaveRequest
+from .search import normalize, search
 
 
 class EmployeeFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(method="filter_by_full_name")
+    search = django_filters.CharFilter(method="search_full_name")
 
     class Meta:
         model = Employee
         fields = ["employee_id", "email", "employee_type", "first_name", "last_name"]
 
     def filter_by_full_name(self, queryset, name, value):
-        return queryset.annotate(
-            full_name=Concat("first_name", Value(" "), "last_name")
-        ).filter(full_name__icontains=value)
+        return queryset.filter(full_name__contains=normalize(value))
+
+    def search_full_name(self, queryset, name, value):
+        return search(queryset, ["full_name"], value, lookup="contains")
 
 
 class AttendanceFilter(django_filters.FilterSet):
     employee_id = django_filters.CharFilter(field_name="employee__employee_id")
     date = django_filters.DateFilter()
-    status = django_filters.ChoiceFilter()
+    status = django_filters.ChoiceFilter(choices=Attendance.Status.choices)
 
     class Meta:
         model = Attendance
@@ -37,7 +38,11 @@ class LeaveRequestFilter(django_filters.FilterSet):
     status = django_filters.CharFilter()
     processor = django_filters.CharFilter(field_name="processor__employee_id")
     response_message = django_filters.CharFilter(lookup_expr="icontains")
+    search = django_filters.CharFilter(method="search_messages")
 
     class Meta:
         model = LeaveRequest
         fields = []
+
+    def search_messages(self, queryset, name, value):
+        return search(queryset, ["message", "response_message"], value)
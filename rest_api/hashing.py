@@ -0,0 +1,87 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+# Below this many passwords the pool's round trips cost more than they save
+PARALLEL_HASH_MIN_PASSWORDS = 16
+# Chunks per worker, so a slow chunk doesn't leave the others idle
+CHUNKS_PER_WORKER = 4
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def default_workers():
+    # process_cpu_count() (3.13+) respects CPU affinity, e.g. in containers
+    return getattr(os, "process_cpu_count", os.cpu_count)() or 1
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def _start_pool(workers):
+    # Never fork: web workers and commands run database pool and listener
+    # threads, which a forked child would inherit mid-flight
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _get_shared_pool():
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = _start_pool(settings.PASSWORD_HASH_WORKERS)
+        return _shared_pool
+
+
+def _discard_shared_pool(pool):
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash ``passwords`` with the configured hasher, in order.
+
+    With ``workers``, the work is spread over a pool of that many processes
+    started for this call, as the ``import_employees`` command does.
+    Otherwise it goes to this process's long-lived pool of
+    ``PASSWORD_HASH_WORKERS`` processes, shared by every request, so
+    concurrent imports can't start more. One worker or fewer hashes inline.
+
+    Pool processes are spawned, not forked. This module imports no models,
+    so they only need the settings, not the app registry.
+    """
+    passwords = list(passwords)
+    size = workers if workers is not None else settings.PASSWORD_HASH_WORKERS
+    if size <= 1 or len(passwords) < PARALLEL_HASH_MIN_PASSWORDS:
+        return _hash_chunk(passwords)
+
+    chunk_size = math.ceil(len(passwords) / (size * CHUNKS_PER_WORKER))
+    chunks = [
+        passwords[start : start + chunk_size]
+        for start in range(0, len(passwords), chunk_size)
+    ]
+    if workers is not None:
+        with _start_pool(min(workers, len(chunks))) as pool:
+            return [
+                hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk
+            ]
+
+    pool = _get_shared_pool()
+    try:
+        return [hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk]
+    except BrokenProcessPool:
+        # A worker died; start a new pool for the next import
+        _discard_shared_pool(pool)
+        raise
@@ -0,0 +1,86 @@
+from datetime import date
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .bitmaps import CODE_STATUSES, NO_RECORD, load_attendance_grid
+from .models import AttendanceMonth
+
+HEATMAP_CACHE_PREFIX = "heatmap"
+# Superseded entries are never read again, so let them expire
+HEATMAP_CACHE_TIMEOUT = 24 * 60 * 60
+
+# One character per day, indexed by bitmap status code
+HEATMAP_SYMBOLS = {
+    NO_RECORD: "-",
+    **{code: status.value[0] for code, status in CODE_STATUSES.items()},
+}
+_SYMBOL_TABLE = np.frombuffer(
+    "".join(HEATMAP_SYMBOLS[code] for code in sorted(HEATMAP_SYMBOLS)).encode(),
+    dtype=np.uint8,
+)
+
+
+def heatmap_legend():
+    legend = {HEATMAP_SYMBOLS[NO_RECORD]: None}
+    legend.update(
+        {HEATMAP_SYMBOLS[code]: status for code, status in CODE_STATUSES.items()}
+    )
+    return legend
+
+
+def _decode(employee_pks, year):
+    employee_pks, grid = load_attendance_grid(
+        employee_pks, date(year, 1, 1), date(year, 12, 31)
+    )
+    encoded = _SYMBOL_TABLE[grid]
+    return {
+        employee_pk: encoded[row].tobytes().decode()
+        for row, employee_pk in enumerate(employee_pks)
+    }
+
+
+def _finished_year(year):
+    """
+    Return ``{employee_pk: days}`` for every employee with attendance in
+    ``year``, as one cache entry keyed by a stamp of the year's monthly
+    rollups, which every rollup write changes.
+    """
+    rollups = AttendanceMonth.objects.filter(
+        month__range=(date(year, 1, 1), date(year, 12, 1))
+    )
+    stamp = rollups.aggregate(rows=Count("pk"), updated_at=Max("updated_at"))
+    if not stamp["rows"]:
+        return {}
+    key = (
+        f"{HEATMAP_CACHE_PREFIX}:{year}:{stamp['rows']}:"
+        f"{stamp['updated_at'].timestamp()}"
+    )
+    heatmaps = cache.get(key)
+    if heatmaps is None:
+        heatmaps = _decode(
+            rollups.values_list("employee_id", flat=True).distinct(), year
+        )
+        cache.set(key, heatmaps, timeout=HEATMAP_CACHE_TIMEOUT)
+    return heatmaps
+
+
+def yearly_heatmaps(employee_pks, year):
+    """
+    Return ``{employee_pk: days}`` where ``days`` holds one status character
+    per day of ``year``, decoded from the monthly bitmaps.
+
+    The current year changes daily, so it is decoded on every request, in
+    one query. Years that are over are cached whole, for every employee.
+    """
+    employee_pks = list(employee_pks)
+    if year >= timezone.localdate().year:
+        return _decode(employee_pks, year)
+
+    heatmaps = _finished_year(year)
+    blank = HEATMAP_SYMBOLS[NO_RECORD] * (date(year, 12, 31).timetuple().tm_yday)
+    return {
+        employee_pk: heatmaps.get(employee_pk, blank) for employee_pk in employee_pks
+    }
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.db import connections
+
+# 2025-01-01T00:00:00Z, in milliseconds
+ID_EPOCH_MS = 1735689600000
+# With 41 bits of milliseconds (good until 2094) ids stay under 2**53,
+# so they survive being parsed as JavaScript numbers
+WORKER_BITS = 6
+SEQUENCE_BITS = 6
+WORKER_COUNT = 1 << WORKER_BITS
+# Worker numbers are leased as PostgreSQL advisory locks on
+# (WORKER_LOCK_SPACE, worker), or elsewhere as lock files
+WORKER_LOCK_SPACE = 0x1D5
+WORKER_LOCK_DIR = os.path.join(tempfile.gettempdir(), "rest_api_id_workers")
+
+
+class WorkerIdError(Exception):
+    pass
+
+
+class IdGenerator:
+    """
+    Snowflake-style generator of time-ordered 53-bit integer ids, laid out
+    as ``timestamp | worker | sequence``.
+
+    Ids from one process are strictly increasing, and ids from different
+    processes differ in their worker bits. Each process leases one of the
+    ``WORKER_COUNT`` worker numbers the first time it generates an id (and
+    again after a fork) and holds it until it exits: on PostgreSQL as a
+    session advisory lock on a connection of its own, elsewhere as a lock
+    file, which only keeps processes on the same host apart. When every
+    number is taken ``WorkerIdError`` is raised rather than risking
+    duplicate ids.
+    """
+
+    def __init__(self, using="default"):
+        self.using = using
+        self.lock = threading.Lock()
+        self.pid = None
+        self.worker = 0
+        self.lease = None
+        self.last = 0
+        self.sequence = 0
+
+    def allocate_worker(self):
+        connection = connections[self.using]
+        if connection.vendor == "postgresql":
+            worker = self.lock_worker(connection)
+        else:
+            worker = self.lock_worker_file()
+        if worker is None:
+            raise WorkerIdError(
+                f"All {WORKER_COUNT} id worker numbers are held by other processes"
+            )
+        return worker
+
+    def lock_worker(self, connection):
+        # Connect directly, since the pool may close a connection, and so
+        # release its locks, while this process still uses the number
+        lease = connection.Database.connect(**connection.get_connection_params())
+        lease.autocommit = True
+        with lease.cursor() as cursor:
+            for worker in range(WORKER_COUNT):
+                cursor.execute(
+                    "SELECT pg_try_advisory_lock(%s, %s)", [WORKER_LOCK_SPACE, worker]
+                )
+                if cursor.fetchone()[0]:
+                    self.lease = lease
+                    return worker
+        lease.close()
+        return None
+
+    def lock_worker_file(self):
+        import fcntl
+
+        os.makedirs(WORKER_LOCK_DIR, exist_ok=True)
+        for worker in range(WORKER_COUNT):
+            lease = open(os.path.join(WORKER_LOCK_DIR, f"{worker}.lock"), "w")
+            try:
+                fcntl.flock(lease, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lease.close()
+                continue
+            self.lease = lease
+            return worker
+        return None
+
+    def __call__(self):
+        with self.lock:
+            if self.pid != os.getpid():
+                self.worker = self.allocate_worker()
+                self.pid = os.getpid()
+
+            now = int(time.time() * 1000) - ID_EPOCH_MS
+            if now > self.last:
+                self.last, self.sequence = now, 0
+            else:
+                # Same millisecond, or the clock went back: carry on from
+                # the last timestamp so ids never repeat or decrease
+                self.sequence += 1
+                if self.sequence >> SEQUENCE_BITS:
+                    self.last, self.sequence = self.last + 1, 0
+
+            return (
+                self.last << (WORKER_BITS + SEQUENCE_BITS)
+                | self.worker << SEQUENCE_BITS
+                | self.sequence
+            )
+
+
+next_id = IdGenerator()
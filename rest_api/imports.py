@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .hashing import hash_passwords
+from .models import Employee, LeaveLedgerEntry
+
+IMPORT_BATCH_SIZE = 500
+
+REQUIRED_FIELDS = {
+    "employee_id": "Employee ID",
+    "employee_type": "Employee type",
+    "first_name": "First name",
+    "last_name": "Last name",
+    "email": "Email",
+    "password": "Password",
+}
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+def read_rows(content, format):
+    """
+    Parse an upload into a list of rows: a CSV file with a header row, or a
+    JSON array of objects.
+    """
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ImportFormatError("The file must be UTF-8 encoded")
+
+    if format == "csv":
+        return list(csv.DictReader(io.StringIO(content)))
+    if format == "json":
+        try:
+            rows = json.loads(content)
+        except ValueError:
+            raise ImportFormatError("The file must contain valid JSON")
+        if not isinstance(rows, list):
+            raise ImportFormatError("A list of employees must be provided")
+        return rows
+    raise ImportFormatError("Format must be csv or json")
+
+
+def _clean(row):
+    """
+    Return the row's employee fields and password, or raise ``ValueError``
+    naming the first problem.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Each employee must be an object")
+
+    fields = {}
+    for field, label in REQUIRED_FIELDS.items():
+        value = row.get(field)
+        if field == "employee_id" and isinstance(value, int):
+            value = str(value)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{label} must be provided")
+        if field != "password":
+            value = value.strip()
+            max_length = Employee._meta.get_field(field).max_length
+            if max_length and len(value) > max_length:
+                raise ValueError(f"{label} must be at most {max_length} characters")
+        fields[field] = value
+
+    if fields["employee_type"] not in Employee.Type.values:
+        raise ValueError("Invalid employee type")
+    try:
+        validate_email(fields["email"])
+    except DjangoValidationError:
+        raise ValueError("Invalid email")
+    fields["email"] = Employee.objects.normalize_email(fields["email"])
+
+    balance = row.get("available_paid_leaves")
+    if balance not in (None, ""):
+        try:
+            if isinstance(balance, bool):
+                raise ValueError
+            balance = int(balance)
+            if balance < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Available paid leaves must be a non-negative integer")
+        fields["available_paid_leaves"] = balance
+
+    return fields, fields.pop("password")
+
+
+def import_employees(rows, dry_run=False, workers=None):
+    """
+    Validate every row, then create the valid ones in bulk.
+
+    Duplicate employee IDs and emails (case-insensitively) are caught
+    within the upload and against existing employees in one query.
+    Passwords are hashed over ``workers`` processes, or by default the
+    shared pool (see ``hash_passwords``), and employees inserted with
+    ``bulk_create``, along with their opening ledger entries, which the
+    skipped ``post_save`` signal would otherwise record. With ``dry_run``
+    nothing is hashed or written.
+    """
+    results = []
+    cleaned = {}
+    seen_ids = set()
+    seen_emails = set()
+
+    for index, row in enumerate(rows):
+        employee_id = row.get("employee_id") if isinstance(row, dict) else None
+        results.append(
+            {
+                "index": index,
+                "employee_id": employee_id,
+                "status": "valid" if dry_run else "created",
+                "error": None,
+            }
+        )
+        try:
+            fields, password = _clean(row)
+            if fields["employee_id"] in seen_ids:
+                raise ValueError("Duplicate employee ID in the import")
+            if fields["email"].lower() in seen_emails:
+                raise ValueError("Duplicate email in the import")
+        except ValueError as error:
+            results[index].update(status="error", error=str(error))
+            continue
+        seen_ids.add(fields["employee_id"])
+        seen_emails.add(fields["email"].lower())
+        cleaned[index] = (fields, password)
+
+    # One query finds every employee ID or email that is already taken
+    taken_ids = set()
+    taken_emails = set()
+    for employee_id, email in (
+        Employee.objects.annotate(email_lower=Lower("email"))
+        .filter(Q(employee_id__in=seen_ids) | Q(email_lower__in=seen_emails))
+        .values_list("employee_id", "email_lower")
+    ):
+        taken_ids.add(employee_id)
+        taken_emails.add(email)
+
+    for index, (fields, _) in list(cleaned.items()):
+        if fields["employee_id"] in taken_ids:
+            error = f"Employee with ID '{fields['employee_id']}' already exists"
+        elif fields["email"].lower() in taken_emails:
+            error = f"Employee with email '{fields['email']}' already exists"
+        else:
+            continue
+        results[index].update(status="error", error=error)
+        del cleaned[index]
+
+    created = 0
+    if cleaned and not dry_run:
+        hashes = hash_passwords(
+            (password for _, password in cleaned.values()), workers=workers
+        )
+        employees = [
+            Employee(**fields, password=hashed)
+            for (fields, _), hashed in zip(cleaned.values(), hashes)
+        ]
+        try:
+            with transaction.atomic():
+                _create(employees)
+            created = len(employees)
+        except IntegrityError:
+            for index in cleaned:
+                results[index].update(
+                    status="error",
+                    error="Employee ID or email was taken during the import",
+                )
+
+    failed = sum(result["status"] == "error" for result in results)
+    return {
+        "dry_run": dry_run,
+        "valid": len(rows) - failed,
+        "created": created,
+        "failed": failed,
+        "results": results,
+    }
+
+
+def _create(employees):
+    Employee.objects.bulk_create(employees, batch_size=IMPORT_BATCH_SIZE)
+    if employees[0].pk is None:
+        # The backend couldn't return the new primary keys
+        pks = dict(
+            Employee.objects.filter(
+                employee_id__in=[employee.employee_id for employee in employees]
+            ).values_list("employee_id", "pk")
+        )
+        for employee in employees:
+            employee.pk = pks[employee.employee_id]
+
+    LeaveLedgerEntry.objects.bulk_create(
+        [
+            LeaveLedgerEntry(
+                employee_id=employee.pk,
+                kind=LeaveLedgerEntry.Kind.ADJUSTMENT,
+                amount=employee.available_paid_leaves,
+                balance=employee.available_paid_leaves,
+                note="Opening balance",
+            )
+            for employee in employees
+            if employee.available_paid_leaves
+        ],
+        batch_size=IMPORT_BATCH_SIZE,
+    )
@@ -0,0 +1,255 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from .events import leave_request_events
+from .ledger import record_entry
+from .models import Attendance, Employee, LeaveLedgerEntry, LeaveRequest
+from .rollups import refresh_attendance_months
+
+APPROVE = "approve"
+DENY = "deny"
+DECISIONS = {
+    APPROVE: LeaveRequest.ApprovalStatus.APPROVED,
+    DENY: LeaveRequest.ApprovalStatus.DENIED,
+}
+
+# Python weekday numbers left out of requests with ``skip_weekends``
+WEEKEND_DAYS = frozenset(getattr(settings, "LEAVE_WEEKEND_DAYS", (5, 6)))
+
+
+class LeaveDecisionError(Exception):
+    pass
+
+
+def leave_days(start_date, end_date=None, skip_weekends=False):
+    """
+    Return the days taken off by a leave request running from ``start_date``
+    through ``end_date`` (inclusive).
+    """
+    end_date = end_date or start_date
+    days = (
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    )
+    if skip_weekends:
+        return [day for day in days if day.weekday() not in WEEKEND_DAYS]
+    return list(days)
+
+
+def find_overlap(employee_pk, start_date, end_date, exclude_uuid=None):
+    """
+    Check, in a single query, whether ``start_date``-``end_date`` overlaps a
+    pending or approved leave request or recorded attendance of the
+    employee. Returns a description of the conflict, or ``None``.
+    """
+    leave_requests = LeaveRequest.objects.filter(
+        Q(end_date__gte=start_date) | Q(end_date__isnull=True, date__gte=start_date),
+        employee_id=OuterRef("pk"),
+        status__in=[
+            LeaveRequest.ApprovalStatus.PENDING,
+            LeaveRequest.ApprovalStatus.APPROVED,
+        ],
+        date__lte=end_date,
+    )
+    if exclude_uuid is not None:
+        leave_requests = leave_requests.exclude(uuid=exclude_uuid)
+    attendances = Attendance.objects.filter(
+        employee_id=OuterRef("pk"), date__range=(start_date, end_date)
+    ).exclude(status=Attendance.Status.ABSENT)
+
+    overlap = (
+        Employee.objects.filter(pk=employee_pk)
+        .values_list(Exists(leave_requests), Exists(attendances))
+        .first()
+    )
+    if overlap and overlap[0]:
+        return "Leave request overlaps another leave request"
+    if overlap and overlap[1]:
+        return "Leave request overlaps recorded attendance"
+    return None
+
+
+def _days_off(leave_requests):
+    # A set, since one statement cannot upsert the same row twice
+    return {
+        (leave.employee_id, day)
+        for leave in leave_requests
+        for day in leave_days(leave.date, leave.end_date, leave.skip_weekends)
+    }
+
+
+def _mark_on_leave(days_off):
+    Attendance.objects.bulk_create(
+        [
+            Attendance(
+                employee_id=employee_pk,
+                date=date,
+                status=Attendance.Status.ON_LEAVE,
+            )
+            for employee_pk, date in days_off
+        ],
+        update_conflicts=True,
+        unique_fields=["employee", "date"],
+        update_fields=["status", "updated_at"],
+    )
+    refresh_attendance_months(days_off)
+
+
+def decide_leave_request(leave_request, processor, decision, response_message=None):
+    """
+    Approve or deny a single leave request in one transaction.
+
+    The status change is a conditional ``UPDATE ... WHERE status =
+    'PENDING'`` and the balance is debited by the request's ``days`` with an
+    ``F()`` update guarded by ``available_paid_leaves >= days``, so
+    concurrent workers can neither decide the same request twice nor lose a
+    debit. The debit is recorded in the leave ledger, and the ``ON_LEAVE``
+    attendance rows for every day of the request are upserted in one
+    statement, replacing any status already recorded.
+    Raises ``LeaveDecisionError`` (and rolls back) when the request cannot
+    be decided.
+    """
+    if leave_request.employee_id == processor.id:
+        raise LeaveDecisionError(f"You cannot {decision} your own leave request")
+
+    with transaction.atomic():
+        decided = LeaveRequest.objects.filter(
+            uuid=leave_request.uuid, status=LeaveRequest.ApprovalStatus.PENDING
+        ).update(
+            status=DECISIONS[decision],
+            processor=processor,
+            response_message=response_message,
+            updated_at=timezone.now(),
+        )
+        if not decided:
+            raise LeaveDecisionError("Leave request is not in PENDING state")
+        leave_request_events.publish(
+            [
+                {
+                    "event": "updated",
+                    "uuid": leave_request.uuid,
+                    "status": DECISIONS[decision],
+                }
+            ]
+        )
+
+        if decision == APPROVE:
+            debited = Employee.objects.filter(
+                id=leave_request.employee_id,
+                available_paid_leaves__gte=leave_request.days,
+            ).update(
+                available_paid_leaves=F("available_paid_leaves") - leave_request.days,
+                updated_at=timezone.now(),
+            )
+            if not debited:
+                raise LeaveDecisionError("No available paid leaves")
+            record_entry(
+                leave_request.employee_id,
+                LeaveLedgerEntry.Kind.DEBIT,
+                -leave_request.days,
+                leave_request.uuid,
+            )
+
+            _mark_on_leave(_days_off([leave_request]))
+
+
+def decide_leave_requests(processor, uuids, decision, response_message=None):
+    """
+    Approve or deny many leave requests at once.
+
+    The requests and their employees are locked with ``SELECT ... FOR
+    UPDATE``, each employee's balance is debited with a single ``F()``
+    update, and the ledger entries and ``ON_LEAVE`` attendance rows are
+    written with one bulk insert each. Returns one ``{"uuid", "status",
+    "error"}`` outcome per uuid.
+    """
+    outcomes = {
+        uuid: {"uuid": uuid, "status": "error", "error": None} for uuid in uuids
+    }
+    approving = decision == APPROVE
+
+    with transaction.atomic():
+        leave_requests = list(
+            LeaveRequest.objects.select_for_update()
+            .filter(uuid__in=outcomes)
+            .only(
+                "uuid",
+                "employee_id",
+                "status",
+                "date",
+                "end_date",
+                "skip_weekends",
+                "days",
+            )
+            .order_by("uuid")
+        )
+        balances = {}
+        if approving:
+            balances = dict(
+                Employee.objects.select_for_update()
+                .filter(id__in={leave.employee_id for leave in leave_requests})
+                .order_by("id")
+                .values_list("id", "available_paid_leaves")
+            )
+
+        decided = []
+        debit_entries = []
+        for leave_request in leave_requests:
+            outcome = outcomes[leave_request.uuid]
+            if leave_request.employee_id == processor.id:
+                outcome["error"] = f"You cannot {decision} your own leave request"
+            elif leave_request.status != LeaveRequest.ApprovalStatus.PENDING:
+                outcome["error"] = "Leave request is not in PENDING state"
+            elif approving and (
+                balances[leave_request.employee_id] < leave_request.days
+            ):
+                outcome["error"] = "No available paid leaves"
+            else:
+                if approving:
+                    balances[leave_request.employee_id] -= leave_request.days
+                    debit_entries.append(
+                        LeaveLedgerEntry(
+                            employee_id=leave_request.employee_id,
+                            kind=LeaveLedgerEntry.Kind.DEBIT,
+                            amount=-leave_request.days,
+                            balance=balances[leave_request.employee_id],
+                            leave_request_id=leave_request.uuid,
+                        )
+                    )
+                outcome["status"] = DECISIONS[decision].lower()
+                decided.append(leave_request)
+
+        LeaveRequest.objects.filter(uuid__in=[leave.uuid for leave in decided]).update(
+            status=DECISIONS[decision],
+            processor=processor,
+            response_message=response_message,
+            updated_at=timezone.now(),
+        )
+        leave_request_events.publish(
+            {"event": "updated", "uuid": leave.uuid, "status": DECISIONS[decision]}
+            for leave in decided
+        )
+
+        if approving and decided:
+            debits = Counter()
+            for leave in decided:
+                debits[leave.employee_id] += leave.days
+            for employee_pk, days in debits.items():
+                Employee.objects.filter(id=employee_pk).update(
+                    available_paid_leaves=F("available_paid_leaves") - days,
+                    updated_at=timezone.now(),
+                )
+            LeaveLedgerEntry.objects.bulk_create(debit_entries)
+
+            _mark_on_leave(_days_off(decided))
+
+    for outcome in outcomes.values():
+        if outcome["status"] == "error" and outcome["error"] is None:
+            outcome["error"] = "Leave request not found"
+
+    return list(outcomes.values())
@@ -0,0 +1,160 @@
+from django.db import connections, transaction
+from django.db.models import CharField, Exists, F, OuterRef, Subquery, Value
+from django.utils import timezone
+
+from .models import Employee, LeaveLedgerEntry
+
+ACCRUE_LEAVES_SQL = f"""
+    WITH credited AS (
+        UPDATE {Employee._meta.db_table} AS employee
+        SET available_paid_leaves = employee.available_paid_leaves + %(amount)s,
+            updated_at = %(created_at)s
+        WHERE employee.is_active AND NOT EXISTS (
+            SELECT 1 FROM {LeaveLedgerEntry._meta.db_table} AS entry
+            WHERE entry.employee_id = employee.id
+                AND entry.kind = %(kind)s
+                AND entry.period = %(period)s
+        )
+        RETURNING employee.id, employee.available_paid_leaves
+    )
+    INSERT INTO {LeaveLedgerEntry._meta.db_table}
+        (employee_id, kind, amount, balance, date, period, note, created_at)
+    SELECT id, %(kind)s, %(amount)s, available_paid_leaves, %(date)s,
+        %(period)s, %(note)s, %(created_at)s
+    FROM credited
+"""
+
+LEDGER_COLUMNS = [
+    "employee_id",
+    "kind",
+    "amount",
+    "balance",
+    "date",
+    "period",
+    "note",
+    "created_at",
+]
+
+
+class LedgerError(Exception):
+    pass
+
+
+def current_balance(employee_pk):
+    """
+    The employee's cached balance as a subquery, so an entry written right
+    after a balance update records it without another round trip.
+    """
+    return Subquery(
+        Employee.objects.filter(pk=employee_pk).values("available_paid_leaves")
+    )
+
+
+def record_entry(employee_pk, kind, amount, leave_request_pk=None, note=None):
+    """
+    Append an entry for a change already applied to the cached balance.
+    Call it in the same transaction, while the employee row is locked by
+    that update.
+    """
+    LeaveLedgerEntry.objects.create(
+        employee_id=employee_pk,
+        kind=kind,
+        amount=amount,
+        balance=current_balance(employee_pk),
+        leave_request_id=leave_request_pk,
+        note=note,
+    )
+
+
+def reverse_entry(entry, note=None):
+    """
+    Undo ``entry`` by posting its negation; the ledger itself is never
+    edited. Raises ``LedgerError`` if the balance would go negative.
+    """
+    with transaction.atomic():
+        reversed_ = Employee.objects.filter(
+            pk=entry.employee_id, available_paid_leaves__gte=entry.amount
+        ).update(
+            available_paid_leaves=F("available_paid_leaves") - entry.amount,
+            updated_at=timezone.now(),
+        )
+        if not reversed_:
+            raise LedgerError("Not enough available paid leaves to reverse")
+        record_entry(
+            entry.employee_id,
+            LeaveLedgerEntry.Kind.REVERSAL,
+            -entry.amount,
+            entry.leave_request_id,
+            note or f"Reverses entry #{entry.pk}",
+        )
+
+
+def accrue_leaves(amount, period, note=None):
+    """
+    Credit every active employee not yet credited for ``period`` with
+    ``amount`` days and record the accruals. On PostgreSQL this is one
+    ``UPDATE ... RETURNING`` feeding an ``INSERT`` in a single statement.
+    Returns the number of employees credited.
+    """
+    params = {
+        "kind": LeaveLedgerEntry.Kind.ACCRUAL.value,
+        "amount": amount,
+        "period": period,
+        "note": note,
+        "date": timezone.localdate(),
+        "created_at": timezone.now(),
+    }
+    connection = connections[LeaveLedgerEntry.objects.db]
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(ACCRUE_LEAVES_SQL, params)
+                return cursor.rowcount
+
+        # Elsewhere, an UPDATE and an INSERT ... SELECT over the same rows
+        employees = Employee.objects.filter(is_active=True).exclude(
+            Exists(
+                LeaveLedgerEntry.objects.filter(
+                    employee=OuterRef("pk"),
+                    kind=params["kind"],
+                    period=period,
+                )
+            )
+        )
+        credited = employees.update(
+            available_paid_leaves=F("available_paid_leaves") + amount,
+            updated_at=params["created_at"],
+        )
+        select = employees.order_by().values_list(
+            "pk",
+            Value(params["kind"]),
+            Value(amount),
+            "available_paid_leaves",
+            Value(params["date"]),
+            Value(period),
+            Value(note, output_field=CharField()),
+            Value(params["created_at"]),
+        )
+        sql, select_params = select.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {LeaveLedgerEntry._meta.db_table} "
+                f"({', '.join(LEDGER_COLUMNS)}) {sql}",
+                select_params,
+            )
+        return credited
+
+
+def balance_as_of(employee_pk, date):
+    """
+    Return the employee's balance at the end of ``date``, read from the
+    latest entry up to that day through the ``(employee, date, id)`` index,
+    or ``None`` if the ledger doesn't go back that far.
+    """
+    return (
+        LeaveLedgerEntry.objects.filter(employee_id=employee_pk, date__lte=date)
+        .order_by("-date", "-id")
+        .values_list("balance", flat=True)
+        .first()
+    )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from rest_api.ledger import accrue_leaves
+
+
+class Command(BaseCommand):
+    help = (
+        "Credit every active employee with paid leaves for a period (the "
+        "current year by default). Employees already credited for the "
+        "period are skipped, so the command is safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("amount", type=int, help="Days to credit")
+        parser.add_argument("--period", help="Accrual period, e.g. 2026")
+        parser.add_argument("--note")
+
+    def handle(self, *args, **options):
+        if options["amount"] <= 0:
+            raise CommandError("The amount must be positive")
+
+        period = options["period"] or str(timezone.localdate().year)
+        credited = accrue_leaves(options["amount"], period, options["note"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Credited {options['amount']} days to {credited} employees "
+                f"for {period}"
+            )
+        )
@@ -0,0 +1,12 @@
+from rest_api.management.loadtest import LoadTestCommand
+
+
+class Command(LoadTestCommand):
+    help = (
+        "Compare requests/sec and p50/p99 latency of the read endpoints "
+        "served by the async views against the DRF views alone, each under "
+        "uvicorn with the same number of workers, on the configured database. "
+        "The employee reading and their token are deleted afterwards."
+    )
+
+    modes = {"sync": {"ASYNC_READS": "0"}, "async": {"ASYNC_READS": "1"}}
@@ -0,0 +1,64 @@
+import statistics
+import time
+
+from django.core.management.base import CommandError
+from django.db import connection
+
+from rest_api.management.loadtest import LoadTestCommand
+
+
+class Command(LoadTestCommand):
+    help = (
+        "Measure what opening a PostgreSQL connection costs, then compare "
+        "requests/sec and p50/p99 latency of the busiest reads under uvicorn "
+        "with the connection pool against a new connection per request. "
+        "Also reports the connections each run opened. The employee reading "
+        "and their token are deleted afterwards. Requires PostgreSQL."
+    )
+
+    modes = {"direct": {"DATABASE_POOL": "0"}, "pooled": {"DATABASE_POOL": "1"}}
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--connects",
+            type=int,
+            default=20,
+            help="Connections to open when timing connection setup",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Connection pooling requires PostgreSQL")
+
+        params = connection.get_connection_params()
+        timings = []
+        for _ in range(options["connects"]):
+            started = time.perf_counter()
+            connection.Database.connect(**params).close()
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(
+            f"Opening a connection takes {statistics.median(timings) * 1000:.1f} ms"
+        )
+
+        self.sessions = {}
+        super().handle(*args, **options)
+        for mode, sessions in self.sessions.items():
+            self.stdout.write(f"{mode}: opened {sessions} connections")
+
+    def run(self, mode, paths, key, options):
+        before = self.session_count()
+        result = super().run(mode, paths, key, options)
+        self.sessions[mode] = self.session_count() - before
+        return result
+
+    def session_count(self):
+        # Statistics are flushed periodically, and when sessions end
+        time.sleep(1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_stat_clear_snapshot()")
+            cursor.execute(
+                "SELECT sessions FROM pg_stat_database WHERE datname = "
+                "current_database()"
+            )
+            return cursor.fetchone()[0]
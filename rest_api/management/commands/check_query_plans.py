@@ -0,0 +1,275 @@
+import json
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from rest_api.management.guards import require_test_database
+from rest_api.models import (
+    Attendance,
+    AttendanceMonth,
+    Employee,
+    LeaveLedgerEntry,
+    LeaveRequest,
+)
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+class Rollback(Exception):
+    pass
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _loads_rows(sql):
+    # Row loads select model columns; version stamps and page counts
+    # select aggregates
+    return sql.startswith('SELECT "') or sql.startswith('SELECT DISTINCT "')
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway data set, request each hot endpoint through its "
+        "real view and assert, via EXPLAIN, that the queries loading its rows "
+        "use an index instead of a sequential scan. All seeded rows are "
+        "rolled back, but the tables are ANALYZEd, so it refuses to run "
+        "against a database whose name doesn't start with 'test' unless "
+        "--force is given. Requires PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=2000)
+        parser.add_argument("--days", type=int, default=60)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run even if the database is not a test database",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plans can only be checked on PostgreSQL")
+        require_test_database(options["force"])
+
+        self.factory = APIRequestFactory()
+        failures = []
+        try:
+            with transaction.atomic():
+                employees, start_date = self.seed(options["employees"], options["days"])
+                for name, path, user in self.checks(employees, start_date):
+                    if not self.uses_index(name, self.queries(path, user)):
+                        failures.append(name)
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(
+                "Sequential scans found in: " + ", ".join(sorted(failures))
+            )
+        self.stdout.write(self.style.SUCCESS("All hot queries use indexes"))
+
+    def seed(self, num_employees, num_days):
+        start_date = date(2000, 1, 1)
+        employees = Employee.objects.bulk_create(
+            Employee(
+                employee_id=f"plan-check-{number}",
+                # The first one requests the privileged views
+                employee_type=(
+                    Employee.Type.PRIVILEGED if number == 0 else Employee.Type.GENERAL
+                ),
+                first_name="Plan",
+                last_name=f"Check {number}",
+                email=f"plan-check-{number}@example.com",
+                password="!",
+            )
+            for number in range(num_employees)
+        )
+
+        # Attendance is recorded day by day, which the planner sees as the
+        # table's correlation with the date index
+        statuses = Attendance.Status.values
+        Attendance.objects.bulk_create(
+            (
+                Attendance(
+                    employee=employee,
+                    date=start_date + timedelta(days=day),
+                    status=statuses[(index + day) % len(statuses)],
+                )
+                for day in range(num_days)
+                for index, employee in enumerate(employees)
+            ),
+            batch_size=5000,
+        )
+        AttendanceMonth.objects.bulk_create(
+            (
+                AttendanceMonth(employee=employee, month=month)
+                for employee in employees
+                for month in {
+                    (start_date + timedelta(days=day)).replace(day=1)
+                    for day in range(num_days)
+                }
+            ),
+            batch_size=5000,
+        )
+
+        # Only a handful of requests are ever pending at a time
+        LeaveRequest.objects.bulk_create(
+            (
+                LeaveRequest(
+                    uuid=index * num_days + day + 1,
+                    employee=employee,
+                    processor=employees[index - 1],
+                    status=self.leave_status(day),
+                    date=start_date + timedelta(days=day),
+                )
+                for index, employee in enumerate(employees)
+                for day in range(0, num_days, 2)
+            ),
+            batch_size=5000,
+        )
+        LeaveRequest.objects.filter(status=LeaveRequest.ApprovalStatus.PENDING).update(
+            processor=None
+        )
+        LeaveLedgerEntry.objects.bulk_create(
+            (
+                LeaveLedgerEntry(
+                    employee=employee,
+                    kind=LeaveLedgerEntry.Kind.DEBIT,
+                    amount=-1,
+                    balance=num_days - day,
+                    date=start_date + timedelta(days=day),
+                )
+                for employee in employees
+                for day in range(0, num_days, 3)
+            ),
+            batch_size=5000,
+        )
+
+        with connection.cursor() as cursor:
+            for model in (
+                Employee,
+                Attendance,
+                AttendanceMonth,
+                LeaveRequest,
+                LeaveLedgerEntry,
+            ):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        return employees, start_date
+
+    def leave_status(self, day):
+        if day % 50 == 0:
+            return LeaveRequest.ApprovalStatus.PENDING
+        if day % 4 == 0:
+            return LeaveRequest.ApprovalStatus.DENIED
+        return LeaveRequest.ApprovalStatus.APPROVED
+
+    def checks(self, employees, start_date):
+        """
+        Return ``(name, path, user)`` for each hot request. Paths ending in
+        ``cursor=`` are checked on their second keyset page.
+        """
+        viewer = employees[0]
+        employee = employees[len(employees) // 2]
+        day = start_date + timedelta(days=3)
+        month = start_date.strftime("%Y-%m")
+        as_of = start_date + timedelta(days=30)
+        return [
+            ("attendance list by date", f"/api/attendances/{day}/", viewer),
+            (
+                "attendance list by status and date",
+                f"/api/attendances/?status={Attendance.Status.LATE}&date={day}",
+                viewer,
+            ),
+            ("attendance keyset page", "/api/attendances/?cursor=", viewer),
+            ("own attendance keyset page", "/api/attendances/?cursor=", employee),
+            (
+                "attendance detail",
+                f"/api/attendances/{day}/{employee.employee_id}/",
+                viewer,
+            ),
+            (
+                "monthly report",
+                f"/api/attendances/{month}/{employee.employee_id}/",
+                viewer,
+            ),
+            ("employee detail", f"/api/employees/{employee.employee_id}/", viewer),
+            (
+                "leave requests pending",
+                f"/api/leave-requests/?status={LeaveRequest.ApprovalStatus.PENDING}"
+                "&cursor=",
+                viewer,
+            ),
+            (
+                "own leave requests by status",
+                f"/api/leave-requests/?status={LeaveRequest.ApprovalStatus.APPROVED}",
+                employee,
+            ),
+            (
+                "leave requests by processor",
+                f"/api/leave-requests/?processor={employee.employee_id}",
+                viewer,
+            ),
+            (
+                "leave requests sparse keyset page",
+                "/api/leave-requests/?fields=uuid,date,status,employee&cursor=",
+                viewer,
+            ),
+            (
+                "leave balance as of",
+                f"/api/employees/{employee.employee_id}/balance/?as_of={as_of}",
+                viewer,
+            ),
+        ]
+
+    def get(self, path, user):
+        """
+        Serve ``path`` to ``user`` with the DRF view its URL resolves to and
+        return the response and the SQL it ran.
+        """
+        match = resolve(urlsplit(path).path)
+        # Skip async_read(), whose handlers only serve token-authenticated
+        # requests
+        view = getattr(match.func, "__wrapped__", match.func)
+        request = self.factory.get(path)
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as captured:
+            response = view(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}")
+        return response, [query["sql"] for query in captured]
+
+    def queries(self, path, user):
+        response, sql = self.get(path, user)
+        if path.endswith("cursor="):
+            next_link = urlsplit(response.data["next"])
+            response, sql = self.get(f"{next_link.path}?{next_link.query}", user)
+        return [query for query in sql if _loads_rows(query)]
+
+    def uses_index(self, name, queries):
+        if not queries:
+            raise CommandError(f"{name} loaded no rows")
+
+        ok = True
+        for sql in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = [node["Node Type"] for node in _plan_nodes(plan[0]["Plan"])]
+            query_ok = "Seq Scan" not in nodes and INDEX_NODES.intersection(nodes)
+            ok = ok and bool(query_ok)
+            label = self.style.SUCCESS("ok") if query_ok else self.style.ERROR("FAIL")
+            self.stdout.write(f"{label} {name}: {' > '.join(nodes)}")
+        return ok
@@ -0,0 +1,65 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_api.hashing import default_workers
+from rest_api.imports import ImportFormatError, import_employees, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import employees from a CSV file (with a header row) or a JSON array. "
+        "Every row is validated before anything is written; rows with errors "
+        "are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "json"],
+            help="File format, by default taken from the file extension",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without hashing passwords or writing",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes, by default one per core",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        try:
+            content = path.read_bytes()
+        except OSError as error:
+            raise CommandError(f"Cannot read {path}: {error}")
+        try:
+            rows = read_rows(content, options["format"] or path.suffix[1:].lower())
+        except ImportFormatError as error:
+            raise CommandError(str(error))
+
+        started = time.perf_counter()
+        result = import_employees(
+            rows,
+            dry_run=options["dry_run"],
+            workers=options["workers"] or default_workers(),
+        )
+        elapsed = time.perf_counter() - started
+
+        for row in result["results"]:
+            if row["error"]:
+                self.stderr.write(
+                    f"Row {row['index'] + 1} ({row['employee_id']}): {row['error']}"
+                )
+
+        if options["dry_run"]:
+            summary = f"{result['valid']} of {len(rows)} employees are valid"
+        else:
+            summary = f"Imported {result['created']} of {len(rows)} employees"
+        style = self.style.SUCCESS if not result["failed"] else self.style.WARNING
+        self.stdout.write(style(f"{summary} in {elapsed:.1f}s"))
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from rest_api.absences import materialize_absences
+
+
+def _date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class Command(BaseCommand):
+    help = (
+        "Record ABSENT attendance for every active employee with no entry on "
+        "the given day (today by default) or date range"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=_date, help="Day to close (YYYY-MM-DD)")
+        parser.add_argument("--from", dest="start_date", type=_date)
+        parser.add_argument("--to", dest="end_date", type=_date)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Absences can only be materialized on PostgreSQL")
+
+        start_date = options["start_date"] or options["date"] or timezone.localdate()
+        end_date = options["end_date"] or options["date"] or start_date
+        if end_date < start_date:
+            raise CommandError("--to must not be before --from")
+
+        inserted = materialize_absences(start_date, end_date)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recorded {inserted} absences from {start_date} to {end_date}"
+            )
+        )
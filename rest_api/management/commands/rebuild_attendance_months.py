@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from rest_api.rollups import rebuild_attendance_months
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly attendance rollups from the attendance table"
+
+    def handle(self, *args, **options):
+        written = rebuild_attendance_months()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} monthly attendance rollups")
+        )
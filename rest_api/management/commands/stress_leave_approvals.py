@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+
+from rest_api.leaves import APPROVE, LeaveDecisionError, decide_leave_request
+from rest_api.management.guards import require_test_database
+from rest_api.models import Attendance, Employee, LeaveLedgerEntry, LeaveRequest
+
+
+class Command(BaseCommand):
+    help = (
+        "Approve leave requests from many threads at once and check that no "
+        "balance debit is lost or missing from the leave ledger, no request "
+        "is approved twice and no approval takes more than --max-queries "
+        "queries. A single-day approval takes 9: BEGIN, the conditional status "
+        "UPDATE, its NOTIFY, the balance UPDATE, the ledger INSERT, the "
+        "attendance upsert, the rollup's SELECT and upsert, and COMMIT. The "
+        "approve endpoint adds one more to load the request. Everything it "
+        "creates is deleted afterwards, but it refuses to run against a "
+        "database whose name doesn't start with 'test' unless --force is "
+        "given. Requires PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--balance", type=int, default=150)
+        parser.add_argument(
+            "--max-queries",
+            type=int,
+            default=9,
+            help="Most queries one approval may take, not counting the view's",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run even if the database is not a test database",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Concurrency can only be checked on PostgreSQL")
+        require_test_database(options["force"])
+
+        processor = Employee.objects.create(
+            employee_id="stress-processor",
+            employee_type=Employee.Type.PRIVILEGED,
+            first_name="Stress",
+            last_name="Processor",
+            email="stress-processor@example.com",
+        )
+        employee = Employee.objects.create(
+            employee_id="stress-employee",
+            first_name="Stress",
+            last_name="Employee",
+            email="stress-employee@example.com",
+            available_paid_leaves=options["balance"],
+        )
+        try:
+            self.run(processor, employee, options)
+        finally:
+            Employee.objects.filter(id__in=[processor.id, employee.id]).delete()
+
+    def run(self, processor, employee, options):
+        start_date = date(2000, 1, 1)
+        leave_requests = LeaveRequest.objects.bulk_create(
+            LeaveRequest(employee=employee, date=start_date + timedelta(days=day))
+            for day in range(options["requests"])
+        )
+        # Every request is approved by two threads at the same time
+        attempts = [leave for leave in leave_requests for _ in range(2)]
+
+        def approve(leave_request):
+            try:
+                with CaptureQueriesContext(connections["default"]) as queries:
+                    try:
+                        decide_leave_request(leave_request, processor, APPROVE)
+                        return True, len(queries)
+                    except LeaveDecisionError:
+                        return False, len(queries)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            outcomes = list(executor.map(approve, attempts))
+
+        approved = sum(1 for ok, _ in outcomes if ok)
+        most_queries = max(count for ok, count in outcomes if ok) if approved else 0
+        employee.refresh_from_db()
+        expected = min(options["balance"], options["requests"])
+
+        checks = {
+            "approvals": (approved, expected),
+            "approved requests": (
+                LeaveRequest.objects.filter(
+                    employee=employee, status=LeaveRequest.ApprovalStatus.APPROVED
+                ).count(),
+                expected,
+            ),
+            "remaining balance": (
+                employee.available_paid_leaves,
+                options["balance"] - expected,
+            ),
+            "ON_LEAVE rows": (
+                Attendance.objects.filter(
+                    employee=employee, status=Attendance.Status.ON_LEAVE
+                ).count(),
+                expected,
+            ),
+            "ledger total": (
+                LeaveLedgerEntry.objects.filter(employee=employee).aggregate(
+                    total=Sum("amount")
+                )["total"],
+                employee.available_paid_leaves,
+            ),
+        }
+        failures = [
+            f"{name}: got {actual}, expected {wanted}"
+            for name, (actual, wanted) in checks.items()
+            if actual != wanted
+        ]
+        if most_queries > options["max_queries"]:
+            failures.append(
+                f"an approval took {most_queries} queries, "
+                f"expected at most {options['max_queries']}"
+            )
+
+        self.stdout.write(
+            f"{len(attempts)} attempts, {approved} approvals, "
+            f"at most {most_queries} queries per approval"
+        )
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("Leave approvals are concurrency safe"))
@@ -0,0 +1,18 @@
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+TEST_DATABASE_PREFIX = "test"
+
+
+def require_test_database(force, using=DEFAULT_DB_ALIAS):
+    """
+    Raise ``CommandError`` unless the database's name starts with ``test``
+    (as Django names test databases) or ``force`` is set, for commands that
+    write throwaway rows to it.
+    """
+    name = str(connections[using].settings_dict["NAME"])
+    if not force and not name.startswith(TEST_DATABASE_PREFIX):
+        raise CommandError(
+            f"Refusing to write to the '{name}' database, which is not a test "
+            "database. Pass --force to run against it anyway."
+        )
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from rest_api.models import Attendance, Employee
+
+
+def _percentile(latencies, fraction):
+    return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+
+
+class LoadTestCommand(BaseCommand):
+    """
+    Base for commands that serve the API with uvicorn once per mode, each
+    with its own environment variables, and compare requests/sec and
+    latency of token-authenticated GETs. The first mode is the baseline.
+    """
+
+    modes = {}
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10, help="Seconds")
+        parser.add_argument("--warmup", type=float, default=2, help="Seconds")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--host-header",
+            help="Host header to send, by default the first ALLOWED_HOSTS entry",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request, repeatable; by default the busiest reads",
+        )
+
+    def handle(self, *args, **options):
+        employee = Employee.objects.order_by("employee_id").first()
+        if employee is None and not options["paths"]:
+            raise CommandError("There are no employees to read")
+
+        viewer = Employee.objects.create(
+            employee_id="benchmark-viewer",
+            employee_type=Employee.Type.PRIVILEGED,
+            first_name="Benchmark",
+            last_name="Viewer",
+            email="benchmark-viewer@example.com",
+        )
+        try:
+            token = Token.objects.create(user=viewer)
+            paths = options["paths"] or self.default_paths(employee)
+            results = {
+                mode: self.run(mode, paths, token.key, options) for mode in self.modes
+            }
+        finally:
+            viewer.delete()
+
+        self.write_results(paths, results, options)
+
+    def default_paths(self, employee):
+        latest = Attendance.objects.filter(employee=employee).order_by("-date").first()
+        paths = [
+            f"/api/employees/{employee.employee_id}/",
+            "/api/attendances/",
+            "/api/leave-requests/",
+        ]
+        if latest is not None:
+            paths += [
+                f"/api/attendances/{latest.date}/{employee.employee_id}/",
+                f"/api/attendances/{latest.date:%Y-%m}/{employee.employee_id}/",
+            ]
+        return paths
+
+    def run(self, mode, paths, key, options):
+        host = options["host_header"] or next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        requests = [
+            (
+                f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Authorization: Token {key}\r\nAccept: application/json\r\n\r\n"
+            ).encode()
+            for path in paths
+        ]
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "api.asgi:application",
+                "--app-dir",
+                str(settings.BASE_DIR),
+                "--port",
+                str(options["port"]),
+                "--workers",
+                str(options["workers"]),
+                "--no-access-log",
+                "--log-level",
+                "warning",
+            ],
+            env={**os.environ, **self.modes[mode]},
+        )
+        try:
+            self.wait_for(server, options["port"])
+            self.stdout.write(f"Benchmarking {mode}...")
+            asyncio.run(self.load(requests, options, options["warmup"]))
+            latencies, errors, elapsed = asyncio.run(
+                self.load(requests, options, options["duration"])
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+        latencies.sort()
+        return {
+            "requests": len(latencies),
+            "rps": len(latencies) / elapsed,
+            "p50": _percentile(latencies, 0.5) * 1000 if latencies else 0,
+            "p99": _percentile(latencies, 0.99) * 1000 if latencies else 0,
+            "errors": errors,
+        }
+
+    def wait_for(self, server, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("uvicorn exited before accepting connections")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"uvicorn did not start within {timeout}s")
+
+    async def load(self, requests, options, duration):
+        """
+        Send ``requests`` round-robin over keep-alive connections for
+        ``duration`` seconds; return the latency of each successful one,
+        the number of failures and the time taken.
+        """
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + duration
+
+        async def client(offset):
+            nonlocal errors
+            reader, writer = await asyncio.open_connection("127.0.0.1", options["port"])
+            sent = offset
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    writer.write(requests[sent % len(requests)])
+                    sent += 1
+                    status = await self.read_response(reader)
+                    if status == 200:
+                        latencies.append(time.perf_counter() - started)
+                    else:
+                        errors += 1
+            finally:
+                writer.close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(n) for n in range(options["concurrency"])))
+        return latencies, errors, time.perf_counter() - started
+
+    async def read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise CommandError("The server closed the connection")
+        length = 0
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        return int(status_line.split()[1])
+
+    def write_results(self, paths, results, options):
+        width = max(len(mode) for mode in results)
+        self.stdout.write(
+            f"{len(paths)} paths, uvicorn --workers {options['workers']}, "
+            f"{options['concurrency']} connections, {options['duration']:g}s each"
+        )
+        self.stdout.write(
+            f"{'':{width}} {'requests':>9} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'errors':>7}"
+        )
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:{width}} {result['requests']:>9} {result['rps']:>9.1f} "
+                f"{result['p50']:>8.1f} {result['p99']:>8.1f} {result['errors']:>7}"
+            )
+
+        (baseline, base), *others = results.items()
+        for mode, result in others:
+            if base["rps"] and result["rps"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{mode}: {result['rps'] / base['rps']:.2f}x requests/sec, "
+                        f"p50 {result['p50'] - base['p50']:+.1f} ms, "
+                        f"{result['p99'] / base['p99']:.2f}x p99 latency "
+                        f"against {baseline}"
+                    )
+                )
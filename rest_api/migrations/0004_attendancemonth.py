@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-16 23:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+def backfill_attendance_months(apps, schema_editor):
+    Attendance = apps.get_model("rest_api", "Attendance")
+    AttendanceMonth = apps.get_model("rest_api", "AttendanceMonth")
+
+    counts = (
+        Attendance.objects.annotate(month=TruncMonth("date"))
+        .values("employee_id", "month")
+        .annotate(
+            present=Count("id", filter=Q(status="PRESENT")),
+            late=Count("id", filter=Q(status="LATE")),
+            absent=Count("id", filter=Q(status="ABSENT")),
+            on_leave=Count("id", filter=Q(status="ON_LEAVE")),
+        )
+        .order_by()
+    )
+    AttendanceMonth.objects.bulk_create(
+        (AttendanceMonth(**row) for row in counts.iterator(chunk_size=1000)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0003_alter_leaverequest_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('on_leave', models.PositiveIntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_months', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('employee', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_attendance_months, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0 on 2026-10-16 23:16
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+# A copy of rest_api.bitmaps.encode_month as of this migration: 3 bits per
+# day of the month, least significant first, 0 meaning no record.
+BITS_PER_DAY = 3
+BYTES_PER_MONTH = 12
+STATUS_CODES = {
+    "PRESENT": 1,
+    "LATE": 2,
+    "ABSENT": 3,
+    "ON_LEAVE": 4,
+}
+
+
+def encode_month(day_statuses):
+    packed = 0
+    for day, status in day_statuses.items():
+        packed |= STATUS_CODES[status] << ((day - 1) * BITS_PER_DAY)
+    return packed.to_bytes(BYTES_PER_MONTH, "little")
+
+
+def backfill_attendance_month_days(apps, schema_editor):
+    Attendance = apps.get_model("rest_api", "Attendance")
+    AttendanceMonth = apps.get_model("rest_api", "AttendanceMonth")
+
+    rollups = {
+        (rollup.employee_id, rollup.month): rollup
+        for rollup in AttendanceMonth.objects.only("id", "employee_id", "month")
+    }
+    rows = (
+        Attendance.objects.order_by("employee_id", "date")
+        .values_list("employee_id", "date", "status")
+        .iterator(chunk_size=10000)
+    )
+    for key, month_rows in groupby(
+        rows, key=lambda row: (row[0], row[1].replace(day=1))
+    ):
+        if key in rollups:
+            rollups[key].days = encode_month(
+                {date.day: status for _, date, status in month_rows}
+            )
+    AttendanceMonth.objects.bulk_update(rollups.values(), ["days"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0004_attendancemonth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancemonth',
+            name='days',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(backfill_attendance_month_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-16 23:30
+
+import rest_api.models
+from django.db import migrations, models
+
+WORKER_SEQUENCE = "rest_api_id_worker_seq"
+
+
+# Existing rows keep their random 10-digit ids, so their URLs keep
+# working; time-ordered ids all sort after them.
+def create_worker_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {WORKER_SEQUENCE}")
+
+
+def drop_worker_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {WORKER_SEQUENCE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0007_leaverequest_date_range'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leaverequest',
+            name='uuid',
+            field=models.BigIntegerField(default=rest_api.models.gen_leave_request_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(create_worker_sequence, drop_worker_sequence),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-16 23:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def open_leave_ledgers(apps, schema_editor):
+    Employee = apps.get_model("rest_api", "Employee")
+    LeaveLedgerEntry = apps.get_model("rest_api", "LeaveLedgerEntry")
+
+    # Each employee's current balance becomes their opening entry
+    LeaveLedgerEntry.objects.bulk_create(
+        (
+            LeaveLedgerEntry(
+                employee_id=employee_pk,
+                kind="ADJUSTMENT",
+                amount=balance,
+                balance=balance,
+                note="Opening balance",
+            )
+            for employee_pk, balance in Employee.objects.values_list(
+                "id", "available_paid_leaves"
+            ).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0008_leaverequest_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ACCRUAL', 'Accrual'), ('DEBIT', 'Debit'), ('ADJUSTMENT', 'Adjustment'), ('REVERSAL', 'Reversal')], max_length=20)),
+                ('amount', models.IntegerField()),
+                ('balance', models.IntegerField()),
+                ('date', models.DateField(default=django.utils.timezone.localdate)),
+                ('period', models.CharField(blank=True, max_length=20, null=True)),
+                ('note', models.CharField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_ledger', to=settings.AUTH_USER_MODEL)),
+                ('leave_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='rest_api.leaverequest')),
+            ],
+            options={
+                'verbose_name_plural': 'leave ledger entries',
+                'indexes': [models.Index(fields=['employee', 'date', 'id'], name='ledger_employee_date_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('kind', 'ACCRUAL')), fields=('employee', 'period'), name='ledger_one_accrual_per_period')],
+            },
+        ),
+        migrations.RunPython(open_leave_ledgers, migrations.RunPython.noop),
+    ]
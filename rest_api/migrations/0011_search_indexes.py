@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-16 23:41
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Trigram indexes serve LIKE '%...%' searches. The leave message ones index
+# the exact expression Django emits for icontains.
+TRIGRAM_INDEXES = {
+    "employee_full_name_trgm_idx": ("rest_api_employee", "full_name"),
+    "leave_message_trgm_idx": ("rest_api_leaverequest", 'UPPER("message"::text)'),
+    "leave_response_message_trgm_idx": (
+        "rest_api_leaverequest",
+        'UPPER("response_message"::text)',
+    ),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, (table, expression) in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (({expression}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0010_tokenrevocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower(django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name')), output_field=models.TextField()),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0012_change_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancemonth',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
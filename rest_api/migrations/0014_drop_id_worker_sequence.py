@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 00:40
+
+from django.db import migrations
+
+WORKER_SEQUENCE = "rest_api_id_worker_seq"
+
+
+# Worker numbers are leased with advisory locks instead, see rest_api.ids
+def drop_worker_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP SEQUENCE IF EXISTS {WORKER_SEQUENCE}")
+
+
+def create_worker_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {WORKER_SEQUENCE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_api', '0013_attendancemonth_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_worker_sequence, create_worker_sequence),
+    ]
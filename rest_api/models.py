@@ -2,8 +2,10 @@ import random
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Concat, Lower
 from django.utils import timezone
 
+from .ids import next_id
 from .managers import CustomUserManager
 
 
@@ -20,6 +22,14 @@ class Employee(AbstractUser):
     )
     employee_id = models.CharField(max_length=20, unique=True)
     available_paid_leaves = models.PositiveIntegerField(default=15)
+    # Lower-cased "first last", trigram indexed on PostgreSQL for search
+    full_name = models.GeneratedField(
+        expression=Lower(Concat("first_name", models.Value(" "), "last_name")),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
+    # Conditional GET version stamp; see rest_api.conditional
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = "employee_id"
     REQUIRED_FIELDS = [
@@ -45,18 +55,59 @@ class Attendance(models.Model):
     )
     date = models.DateField(default=timezone.now)
     status = models.TextField(max_length=20, choices=Status.choices)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = "employee", "date"
+        indexes = [
+            models.Index(fields=["date", "id"], name="attendance_date_id_idx"),
+            models.Index(fields=["status", "date"], name="attendance_status_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.employee.first_name} {self.employee.last_name} - {self.date} - {self.status}"
 
 
+class AttendanceMonth(models.Model):
+    """
+    Per-employee, per-month attendance counts rolled up from ``Attendance``.
+
+    Rows are kept current by the signal handlers in ``rest_api.signals`` and
+    by ``rest_api.rollups.refresh_attendance_months`` for bulk writes.
+    """
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="attendance_months"
+    )
+    month = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    on_leave = models.PositiveIntegerField(default=0)
+    # Packed per-day statuses, see rest_api.bitmaps
+    days = models.BinaryField(default=bytes)
+    # Part of the cache keys of the heatmaps decoded from ``days``
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = "employee", "month"
+
+    def __str__(self):
+        return (
+            f"{self.employee.first_name} {self.employee.last_name} - {self.month:%Y-%m}"
+        )
+
+
 def gen_num_uuid():
+    # Random 10-digit ids of requests created before time-ordered ids; only
+    # kept for old migrations. All new ids are larger than these.
     return random.randint(1000000000, 9999999999)
 
 
+def gen_leave_request_id():
+    return next_id()
+
+
 class LeaveRequest(models.Model):
     class ApprovalStatus(models.TextChoices):
         PENDING = "PENDING", "Pending"
@@ -64,7 +115,7 @@ class LeaveRequest(models.Model):
         DENIED = "DENIED", "Denied"
 
     uuid = models.BigIntegerField(
-        primary_key=True, default=gen_num_uuid, editable=False
+        primary_key=True, default=gen_leave_request_id, editable=False
     )
     employee = models.ForeignKey(
         Employee, on_delete=models.CASCADE, related_name="leave_requests"
@@ -80,9 +131,94 @@ class LeaveRequest(models.Model):
         max_length=20, choices=ApprovalStatus.choices, default=ApprovalStatus.PENDING
     )
     date = models.DateField()
+    # Multi-day requests run from ``date`` through ``end_date``
+    end_date = models.DateField(blank=True, null=True)
+    skip_weekends = models.BooleanField(default=False)
+    days = models.PositiveIntegerField(default=1, editable=False)
     message = models.CharField(blank=True, null=True)
     response_message = models.CharField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "uuid"], name="leave_date_uuid_idx"),
+            models.Index(fields=["status", "date"], name="leave_status_date_idx"),
+            models.Index(
+                fields=["employee", "status", "date"],
+                name="leave_employee_status_idx",
+            ),
+            models.Index(fields=["processor", "date"], name="leave_processor_date_idx"),
+            models.Index(
+                fields=["date", "uuid"],
+                name="leave_pending_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
 
     def __str__(self):
         return f"Request #{self.uuid} - {self.employee.first_name} {self.employee.last_name} - {self.date} - {self.status}"
+
+
+class LeaveLedgerEntry(models.Model):
+    class Kind(models.TextChoices):
+        ACCRUAL = "ACCRUAL", "Accrual"
+        DEBIT = "DEBIT", "Debit"
+        ADJUSTMENT = "ADJUSTMENT", "Adjustment"
+        REVERSAL = "REVERSAL", "Reversal"
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="leave_ledger"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    amount = models.IntegerField()
+    # The employee's available paid leaves right after this entry
+    balance = models.IntegerField()
+    date = models.DateField(default=timezone.localdate)
+    # Accruals are credited at most once per employee and period
+    period = models.CharField(max_length=20, blank=True, null=True)
+    leave_request = models.ForeignKey(
+        LeaveRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ledger_entries",
+    )
+    note = models.CharField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "leave ledger entries"
+        indexes = [
+            models.Index(
+                fields=["employee", "date", "id"], name="ledger_employee_date_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee", "period"],
+                condition=models.Q(kind="ACCRUAL"),
+                name="ledger_one_accrual_per_period",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.first_name} {self.employee.last_name} - {self.date} - {self.kind} {self.amount:+d}"
+
+
+class TokenRevocation(models.Model):
+    """
+    A revoked signed token (``jti``), or, without a ``jti``, every token the
+    employee was issued up to ``revoked_at``. Rows are only needed until
+    the tokens they cover would have expired anyway.
+    """
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="token_revocations"
+    )
+    jti = models.CharField(max_length=32, blank=True, null=True)
+    revoked_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.employee} - {self.jti or 'all tokens'} - {self.revoked_at}"
@@ -0,0 +1,147 @@
+import base64
+import json
+from functools import reduce
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset (cursor) pagination when
+    the request carries a ``cursor`` query parameter.
+
+    Keyset pages are selected with a ``WHERE (key) > (last key)`` condition
+    on the view's ``keyset_ordering`` instead of an OFFSET, and no
+    ``COUNT(*)`` is issued. Pass ``?cursor=`` to start from the first page
+    and ``?estimate=true`` to include a planner-estimated total (PostgreSQL
+    only). Any ``?ordering=`` is ignored in keyset mode.
+    """
+
+    cursor_query_param = "cursor"
+    estimate_query_param = "estimate"
+    invalid_cursor_message = "Invalid cursor"
+    keyset_by_default = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = getattr(view, "keyset_ordering", None)
+        if not self.keyset or (
+            not self.keyset_by_default
+            and self.cursor_query_param not in request.query_params
+        ):
+            self.keyset = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        key, reverse = self.decode_cursor(request, queryset.model)
+        self.has_cursor = key is not None
+        self.reverse = reverse
+        self.estimated_count = None
+        if request.query_params.get(self.estimate_query_param) in ("1", "true"):
+            self.estimated_count = self.estimate_count(queryset)
+
+        ordering = [f"-{field}" if reverse else field for field in self.keyset]
+        queryset = queryset.order_by(*ordering)
+        if key is not None:
+            queryset = queryset.filter(self.after(key, reverse))
+
+        results = list(queryset[: page_size + 1])
+        self.has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.page_results = results
+        return results
+
+    def after(self, key, reverse):
+        """
+        Build ``(f1, f2, ...) > (v1, v2, ...)`` as an OR of equality
+        prefixes, which every backend can match against a composite index.
+        """
+        lookup = "lt" if reverse else "gt"
+        conditions = []
+        for position, field in enumerate(self.keyset):
+            prefix = dict(zip(self.keyset[:position], key[:position]))
+            conditions.append(Q(**prefix, **{f"{field}__{lookup}": key[position]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    def estimate_count(self, queryset):
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = payload["k"]
+            if len(values) != len(self.keyset):
+                raise ValueError
+            key = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.keyset, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return key, bool(payload.get("r"))
+
+    def encode_cursor(self, instance, reverse):
+        values = []
+        for field in self.keyset:
+            value = getattr(instance, field)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = {"k": values, "r": reverse} if reverse else {"k": values}
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.page_results or not (self.has_more or self.reverse):
+            return None
+        return self.encode_cursor(self.page_results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.page_results or not (
+            self.has_more if self.reverse else self.has_cursor
+        ):
+            return None
+        return self.encode_cursor(self.page_results[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.estimated_count is not None:
+            response["estimated_count"] = self.estimated_count
+        return Response(response)
+
+
+class QueuePagination(KeysetPagination):
+    """
+    Keyset pagination even without a ``cursor``, for frequently polled
+    queues that should never be counted or offset.
+    """
+
+    keyset_by_default = True
@@ -1,3 +1,4 @@
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import BasePermission
 
 
@@ -22,7 +23,70 @@ class IsGeneral(BasePermission):
 class IsOwner(BasePermission):
     """
     Custom permission to only allow owners of an object to edit it.
+
+    Ownership is read from the view's ``owner_field`` and compared by
+    primary key, so checking it never loads the related employee.
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj.employee == request.user
+        owner_field = getattr(view, "owner_field", "employee")
+        if owner_field != "pk":
+            owner_field = obj._meta.get_field(owner_field).attname
+        return getattr(obj, owner_field) == request.user.pk
+
+
+class OwnerScopedMixin:
+    """
+    ViewSet mixin that limits general users to their own rows in the
+    queryset's WHERE clause, so ownership costs no extra query and other
+    employees' rows are simply not found.
+
+    ``owner_field`` is the lookup from the queryset's model to the owning
+    employee, and ``owner_url_kwarg`` the URL keyword naming an employee,
+    which general users may only set to their own ``employee_id``.
+    """
+
+    owner_field = "employee"
+    owner_url_kwarg = "employee_id"
+    unauthorized_message = "You are not authorized to access this resource"
+
+    def is_general(self):
+        return IsGeneral().has_permission(self.request, self)  # pyright: ignore
+
+    def requested_employee_id(self):
+        """
+        Return the ``employee_id`` named by the URL, or ``None``.
+        """
+        employee_id = self.kwargs.get(self.owner_url_kwarg)  # pyright: ignore
+        if (
+            employee_id is not None
+            and self.is_general()
+            and employee_id != self.request.user.employee_id  # pyright: ignore
+        ):
+            raise PermissionDenied(self.unauthorized_message)
+        return employee_id
+
+    def scope_queryset(self, queryset):
+        if self.is_general():
+            queryset = queryset.filter(
+                **{self.owner_field: self.request.user.pk}  # pyright: ignore
+            )
+        return queryset
+
+    def scope_employees(self, employees, employee_ids=()):
+        """
+        Narrow an ``Employee`` queryset to ``employee_ids`` (all employees
+        when empty); general users may only ask for themselves.
+        """
+        if self.is_general():
+            user = self.request.user  # pyright: ignore
+            if any(employee_id != user.employee_id for employee_id in employee_ids):
+                raise PermissionDenied(self.unauthorized_message)
+            return employees.filter(pk=user.pk)
+        if employee_ids:
+            employees = employees.filter(employee_id__in=employee_ids)
+        return employees
+
+    def get_queryset(self):
+        self.requested_employee_id()
+        return self.scope_queryset(super().get_queryset())  # pyright: ignore
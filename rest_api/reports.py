@@ -0,0 +1,274 @@
+import calendar
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FilteredRelation,
+    OuterRef,
+    Q,
+    Subquery,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .bitmaps import CODE_STATUSES, NO_RECORD, STATUS_CODES, load_attendance_grid
+from .models import Attendance
+
+# Counted per month by annotate_monthly_counts(), by status
+MONTHLY_FIELDS = {
+    Attendance.Status.PRESENT: "present",
+    Attendance.Status.LATE: "late",
+    Attendance.Status.ON_LEAVE: "on_leave",
+}
+
+
+def month_range(start_date):
+    """Return the first and last day of the month starting at ``start_date``."""
+    _, num_days = calendar.monthrange(start_date.year, start_date.month)
+    return start_date, start_date.replace(day=num_days)
+
+
+def previous_month_range(start_date):
+    prev_end_date = start_date.replace(day=1) - timedelta(days=1)
+    return prev_end_date.replace(day=1), prev_end_date
+
+
+def report_sources(employees, start_date, end_date):
+    """
+    Return the querysets a report on ``employees``' attendance between the
+    two dates is built from, to version-stamp it.
+    """
+    attendances = Attendance.objects.filter(
+        employee__in=employees.values("pk"), date__range=(start_date, end_date)
+    )
+    return employees, attendances
+
+
+def working_days(employee, start_date, end_date, today):
+    """
+    Return the first and last day in ``[start_date, end_date]`` on which
+    ``employee`` was expected to show up as of ``today``: from the local
+    date they joined through ``today``. There are none when the first is
+    after the last.
+    """
+    first = max(start_date, timezone.localdate(employee.date_joined))
+    return first, min(end_date, today)
+
+
+def _count_days(first, last):
+    return max((last - first).days + 1, 0)
+
+
+def _attended(start_date, end_date, status=None):
+    # Attendance.date is compared with date_joined in the current time
+    # zone, like working_days()
+    attendances = Attendance.objects.filter(
+        employee=OuterRef("pk"),
+        date__range=(start_date, end_date),
+        date__gte=OuterRef("date_joined__date"),
+    )
+    if status:
+        attendances = attendances.filter(status=status)
+    else:
+        attendances = attendances.exclude(status=Attendance.Status.ABSENT)
+    count = attendances.values("employee").annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(count), 0)
+
+
+def _since_joining(rollup, start_date, end_date, status=None):
+    """
+    Count attendance in a month that is over from its ``AttendanceMonth``
+    rollup, which spans the whole month, unless the employee joined after
+    it started.
+    """
+    return Case(
+        When(date_joined__date__lte=start_date, then=Coalesce(rollup, 0)),
+        default=_attended(start_date, end_date, status),
+    )
+
+
+def _rollup(month):
+    return FilteredRelation(
+        "attendance_months", condition=Q(attendance_months__month=month)
+    )
+
+
+def annotate_monthly_counts(queryset, start_date, end_date, today):
+    """
+    Annotate an ``Employee`` queryset with per-status attendance counts for
+    the given month and the month before it, in a single query. Only days
+    from the one an employee joined on count, as in ``working_days``.
+
+    Months that are already over are read from the ``AttendanceMonth``
+    rollup, unless the employee joined after they started; a month that is
+    still running is counted from ``Attendance`` so that rows dated after
+    ``today`` (e.g. approved leave) are ignored. Absences are not counted
+    here since they are mostly missing rows; see ``monthly_summary``.
+    """
+    prev_start_date, prev_end_date = previous_month_range(start_date)
+
+    if end_date < today:
+        queryset = queryset.annotate(this_month=_rollup(start_date))
+        counts = {
+            field: _since_joining(
+                F(f"this_month__{field}"), start_date, end_date, status
+            )
+            for status, field in MONTHLY_FIELDS.items()
+        }
+    else:
+        end_date = min(end_date, today)
+        counts = {
+            field: _attended(start_date, end_date, status)
+            for status, field in MONTHLY_FIELDS.items()
+        }
+
+    if prev_end_date < today:
+        queryset = queryset.annotate(last_month=_rollup(prev_start_date))
+        counts["attended_last_month"] = _since_joining(
+            F("last_month__present")
+            + F("last_month__late")
+            + F("last_month__on_leave"),
+            prev_start_date,
+            prev_end_date,
+        )
+    else:
+        counts["attended_last_month"] = _attended(
+            prev_start_date, min(prev_end_date, today)
+        )
+
+    return queryset.annotate(**counts)
+
+
+def monthly_summary(employee, start_date, end_date, today):
+    """
+    Build the summary row for an employee annotated by
+    ``annotate_monthly_counts``.
+    """
+    prev_start_date, prev_end_date = previous_month_range(start_date)
+
+    expected = _count_days(*working_days(employee, start_date, end_date, today))
+    expected_last_month = _count_days(
+        *working_days(employee, prev_start_date, prev_end_date, today)
+    )
+
+    return {
+        "employee_id": employee.employee_id,
+        "present": employee.present,
+        "late": employee.late,
+        "on_leave": employee.on_leave,
+        "absent": expected - employee.present - employee.late - employee.on_leave,
+        "absent_last_month": expected_last_month - employee.attended_last_month,
+        "available_paid_leaves": employee.available_paid_leaves,
+    }
+
+
+def month_report(employee, logs, start_date, end_date, today):
+    """
+    Build the day-by-day report for one month from an employee annotated
+    by ``annotate_monthly_counts`` and their ``Attendance`` rows in it.
+    Days without a row up to ``today`` are reported absent.
+    """
+    # Convert to a dictionary for fast lookup: { date_obj: log_obj }
+    logs_dict = {log.date: log for log in logs}
+
+    full_report = {
+        "employee_id": employee.employee_id,
+        "absent_this_month": 0,
+        "absent_last_month": 0,
+        "available_paid_leaves": employee.available_paid_leaves,
+        "logs": [],
+    }
+
+    current_check, last = working_days(employee, start_date, end_date, today)
+    while current_check <= last:
+        if current_check in logs_dict:
+            entry = logs_dict[current_check]
+            if entry.status == Attendance.Status.ABSENT:
+                full_report["absent_this_month"] += 1
+            full_report["logs"].append(
+                {
+                    "date": current_check,
+                    "day": calendar.day_name[current_check.weekday()],
+                    "status": entry.status,  # e.g., 'Present', 'Late'
+                }
+            )
+        else:
+            full_report["absent_this_month"] += 1
+            full_report["logs"].append(
+                {
+                    "date": current_check,
+                    "day": calendar.day_name[current_check.weekday()],
+                    "status": "ABSENT",
+                }
+            )
+
+        current_check += timedelta(days=1)
+
+    full_report["absent_last_month"] = monthly_summary(
+        employee, start_date, end_date, today
+    )["absent_last_month"]
+
+    return full_report
+
+
+def range_reports(employees, start_date, end_date, today, include_logs=True):
+    """
+    Build per-employee attendance reports over ``[start_date, end_date]``.
+
+    Statuses come from the packed monthly bitmaps and days without a row
+    are marked absent with array operations over the whole range. Days
+    before an employee joined or after ``today`` are left out.
+    """
+    employees = list(employees)
+    _, grid = load_attendance_grid(
+        [employee.pk for employee in employees], start_date, end_date
+    )
+    absent = STATUS_CODES[Attendance.Status.ABSENT]
+    grid[grid == NO_RECORD] = absent
+
+    days = np.arange(grid.shape[1])
+    # Offsets of each employee's first and last working day in the range
+    spans = np.array(
+        [
+            [
+                (day - start_date).days
+                for day in working_days(employee, start_date, end_date, today)
+            ]
+            for employee in employees
+        ]
+    ).reshape(-1, 2)
+    expected = (days >= spans[:, :1]) & (days <= spans[:, 1:])
+
+    counts = {
+        status.lower(): ((grid == code) & expected).sum(axis=1)
+        for status, code in STATUS_CODES.items()
+    }
+
+    if include_logs:
+        dates = [start_date + timedelta(days=int(day)) for day in days]
+        day_names = [calendar.day_name[date.weekday()] for date in dates]
+        statuses = [CODE_STATUSES.get(code) for code in range(max(CODE_STATUSES) + 1)]
+
+    reports = []
+    for row, employee in enumerate(employees):
+        report = {"employee_id": employee.employee_id}
+        report.update({status: int(count[row]) for status, count in counts.items()})
+        if include_logs:
+            report["logs"] = [
+                {
+                    "date": dates[day],
+                    "day": day_names[day],
+                    "status": statuses[code],
+                }
+                for day, code in zip(
+                    np.flatnonzero(expected[row]).tolist(),
+                    grid[row][expected[row]].tolist(),
+                )
+            ]
+        reports.append(report)
+
+    return reports
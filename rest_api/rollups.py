@@ -0,0 +1,116 @@
+from collections import Counter
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Q
+
+from .bitmaps import encode_month
+from .models import Attendance, AttendanceMonth
+from .reports import month_range
+
+ROLLUP_BATCH_SIZE = 1000
+
+STATUS_FIELDS = {
+    Attendance.Status.PRESENT: "present",
+    Attendance.Status.LATE: "late",
+    Attendance.Status.ABSENT: "absent",
+    Attendance.Status.ON_LEAVE: "on_leave",
+}
+
+
+def month_of(date):
+    # Attendance.date defaults to timezone.now, so unsaved-then-saved
+    # instances can still carry a datetime or a string here
+    return Attendance._meta.get_field("date").to_python(date).replace(day=1)
+
+
+def _attendance_rows(queryset):
+    return queryset.order_by("employee_id", "date").values_list(
+        "employee_id", "date", "status"
+    )
+
+
+def _rollup_rows(attendance_rows):
+    """
+    Fold ``(employee_pk, date, status)`` rows, ordered by employee and date,
+    into one ``AttendanceMonth`` per employee and month.
+    """
+    grouped = groupby(attendance_rows, key=lambda row: (row[0], month_of(row[1])))
+    for (employee_pk, month), rows in grouped:
+        day_statuses = {date.day: status for _, date, status in rows}
+        counts = Counter(day_statuses.values())
+        yield AttendanceMonth(
+            employee_id=employee_pk,
+            month=month,
+            days=encode_month(day_statuses),
+            **{field: counts[status] for status, field in STATUS_FIELDS.items()},
+        )
+
+
+def refresh_attendance_months(pairs):
+    """
+    Recompute the ``AttendanceMonth`` rows for the given
+    ``(employee_pk, date)`` pairs from the underlying ``Attendance`` rows.
+
+    Any date within a month identifies that month. Months that no longer
+    have any attendance are removed.
+    """
+    months = {(employee_pk, month_of(date)) for employee_pk, date in pairs}
+    if not months:
+        return
+
+    employee_pks = {employee_pk for employee_pk, _ in months}
+    first_month = min(month for _, month in months)
+    _, last_day = month_range(max(month for _, month in months))
+
+    attendance_rows = _attendance_rows(
+        Attendance.objects.filter(
+            employee_id__in=employee_pks, date__range=(first_month, last_day)
+        )
+    )
+    rows = [
+        row
+        for row in _rollup_rows(attendance_rows)
+        if (row.employee_id, row.month) in months
+    ]
+    stale = months - {(row.employee_id, row.month) for row in rows}
+
+    # Usually runs inside the caller's transaction; a savepoint buys nothing
+    with transaction.atomic(savepoint=False):
+        AttendanceMonth.objects.bulk_create(
+            rows,
+            batch_size=ROLLUP_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["employee", "month"],
+            update_fields=[*STATUS_FIELDS.values(), "days", "updated_at"],
+        )
+        if stale:
+            stale_filter = Q()
+            for employee_pk, month in stale:
+                stale_filter |= Q(employee_id=employee_pk, month=month)
+            AttendanceMonth.objects.filter(stale_filter).delete()
+
+
+def rebuild_attendance_months():
+    """
+    Throw away every ``AttendanceMonth`` row and rebuild the table from
+    ``Attendance``. Returns the number of rows written.
+    """
+    attendance_rows = _attendance_rows(Attendance.objects.all()).iterator(
+        chunk_size=ROLLUP_BATCH_SIZE * 10
+    )
+
+    with transaction.atomic():
+        AttendanceMonth.objects.all().delete()
+        written = 0
+        batch = []
+        for row in _rollup_rows(attendance_rows):
+            batch.append(row)
+            if len(batch) == ROLLUP_BATCH_SIZE:
+                AttendanceMonth.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        AttendanceMonth.objects.bulk_create(batch)
+        written += len(batch)
+
+    return written
@@ -0,0 +1,64 @@
+from functools import reduce
+from operator import or_
+
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest, Lower
+
+# Longer queries are cut down to their first few words
+MAX_SEARCH_TERMS = 5
+
+
+def normalize(value):
+    """
+    Lower-case ``value`` and collapse its whitespace, the way
+    ``Employee.full_name`` is stored.
+    """
+    return " ".join(value.lower().split())
+
+
+def _rank(vendor, fields, query):
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        ranks = [
+            TrigramWordSimilarity(Value(query), Coalesce(Lower(field), Value("")))
+            for field in fields
+        ]
+    else:
+        # Elsewhere an exact match ranks above a prefix, and that above a
+        # match at the start of a later word
+        ranks = [
+            Case(
+                When(**{f"{field}__iexact": query}, then=Value(3.0)),
+                When(**{f"{field}__istartswith": query}, then=Value(2.0)),
+                When(**{f"{field}__icontains": f" {query}"}, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            for field in fields
+        ]
+    return ranks[0] if len(ranks) == 1 else Greatest(*ranks)
+
+
+def search(queryset, fields, value, lookup="icontains"):
+    """
+    Filter ``queryset`` to rows where each word of ``value`` appears in one
+    of ``fields``, best matches first.
+
+    Each word is matched with ``lookup``, which the PostgreSQL trigram
+    indexes are built to serve (``contains`` for columns stored lower-case,
+    ``icontains`` otherwise), so only matching rows get ranked. Keyset
+    pagination orders by its own key and ignores the ranking.
+    """
+    terms = normalize(value).split()[:MAX_SEARCH_TERMS]
+    if not terms:
+        return queryset
+    for term in terms:
+        queryset = queryset.filter(
+            reduce(or_, (Q(**{f"{field}__{lookup}": term}) for field in fields))
+        )
+    vendor = connections[queryset.db].vendor
+    return queryset.annotate(
+        search_rank=_rank(vendor, fields, " ".join(terms))
+    ).order_by("-search_rank", *queryset.query.order_by)
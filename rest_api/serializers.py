@@ -1,7 +1,14 @@
+from datetime import timedelta
+
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 
-from .models import Attendance, Employee, LeaveRequest
+from .fieldsets import SparseFieldsetSerializerMixin
+from .leaves import find_overlap, leave_days
+from .models import Attendance, Employee, LeaveLedgerEntry, LeaveRequest
+
+LEAVE_REQUEST_MAX_DAYS = 366
 
 
 class EmployeeAuthTokenSerializer(AuthTokenSerializer):
@@ -13,7 +20,9 @@ class EmployeeAuthTokenSerializer(AuthTokenSerializer):
         return super().validate(attrs)
 
 
-class EmployeeSerializer(serializers.HyperlinkedModelSerializer):
+class EmployeeSerializer(
+    SparseFieldsetSerializerMixin, serializers.HyperlinkedModelSerializer
+):
     class Meta:  # pyright: ignore
         model = Employee
         fields = [
@@ -36,16 +45,26 @@ class EmployeeSerializer(serializers.HyperlinkedModelSerializer):
 
     def update(self, instance, validated_data):
         password = validated_data.pop("password", None)
-        instance = super().update(instance, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        update_fields = [*validated_data, "updated_at"]
 
         if password:
             instance.set_password(password)
-            instance.save()
+            update_fields.append("password")
+
+        # Only the submitted fields are written, so a stale balance can't
+        # overwrite a concurrent debit; balance changes are recorded in the
+        # leave ledger on save
+        with transaction.atomic():
+            instance.save(update_fields=update_fields)
 
         return instance
 
 
-class AttendanceSerializer(serializers.HyperlinkedModelSerializer):
+class AttendanceSerializer(
+    SparseFieldsetSerializerMixin, serializers.HyperlinkedModelSerializer
+):
     employee_id = serializers.SlugRelatedField(
         queryset=Employee.objects.all(),
         slug_field="employee_id",
@@ -68,7 +87,9 @@ class AttendanceSerializer(serializers.HyperlinkedModelSerializer):
         return fields
 
 
-class LeaveRequestSerializer(serializers.HyperlinkedModelSerializer):
+class LeaveRequestSerializer(
+    SparseFieldsetSerializerMixin, serializers.HyperlinkedModelSerializer
+):
     employee = EmployeeSerializer(read_only=True)
     processor = EmployeeSerializer(read_only=True)
 
@@ -79,6 +100,9 @@ class LeaveRequestSerializer(serializers.HyperlinkedModelSerializer):
             "created_at",
             "employee",
             "date",
+            "end_date",
+            "skip_weekends",
+            "days",
             "message",
             "status",
             "processor",
@@ -88,3 +112,64 @@ class LeaveRequestSerializer(serializers.HyperlinkedModelSerializer):
             "message": {"required": False},
             "response_message": {"required": False},
         }
+        expandable_fields = {"employee": "employee_id", "processor": "employee_id"}
+
+    def validate(self, attrs):
+        instance = self.instance
+        start_date = attrs.get("date", instance and instance.date)
+        end_date = attrs.get("end_date", instance and instance.end_date)
+        skip_weekends = attrs.get(
+            "skip_weekends", instance.skip_weekends if instance else False
+        )
+        end_date = end_date or start_date
+
+        if end_date < start_date:
+            raise serializers.ValidationError(
+                {"end_date": "end_date cannot be before date"}
+            )
+        if end_date - start_date >= timedelta(days=LEAVE_REQUEST_MAX_DAYS):
+            raise serializers.ValidationError(
+                {
+                    "end_date": (
+                        f"A leave request spans at most {LEAVE_REQUEST_MAX_DAYS} days"
+                    )
+                }
+            )
+
+        days = len(leave_days(start_date, end_date, skip_weekends))
+        if not days:
+            raise serializers.ValidationError("Leave request covers no working days")
+
+        employee = instance.employee if instance else self.context["request"].user
+        if instance is None and days > employee.available_paid_leaves:
+            raise serializers.ValidationError("Not enough available paid leaves")
+
+        if {"date", "end_date", "skip_weekends"} & attrs.keys():
+            overlap = find_overlap(
+                employee.pk, start_date, end_date, instance and instance.uuid
+            )
+            if overlap:
+                raise serializers.ValidationError(overlap)
+
+        attrs["days"] = days
+        return attrs
+
+
+class LeaveLedgerEntrySerializer(
+    SparseFieldsetSerializerMixin, serializers.HyperlinkedModelSerializer
+):
+    leave_request = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:  # pyright: ignore
+        model = LeaveLedgerEntry
+        fields = [
+            "id",
+            "date",
+            "kind",
+            "amount",
+            "balance",
+            "period",
+            "leave_request",
+            "note",
+            "created_at",
+        ]
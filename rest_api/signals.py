@@ -0,0 +1,150 @@
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import SNAPSHOT_FIELDS, invalidate_cached_tokens
+from .events import leave_request_events
+from .ledger import record_entry
+from .models import Attendance, Employee, LeaveLedgerEntry, LeaveRequest
+from .rollups import refresh_attendance_months
+from .tokens import revoke_deleted_employee_tokens, revoke_employee_tokens
+
+# Fields signed access tokens vouch for; changing any revokes the employee's
+# tokens
+CREDENTIAL_FIELDS = ("password", "employee_id", "employee_type", "is_active")
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    instance._previous_key = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_key = (
+        Attendance.objects.filter(pk=instance.pk)
+        .values_list("employee_id", "date")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Attendance)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pairs = {(instance.employee_id, instance.date)}
+    if getattr(instance, "_previous_key", None):
+        pairs.add(instance._previous_key)
+    refresh_attendance_months(pairs)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    refresh_attendance_months({(instance.employee_id, instance.date)})
+
+
+@receiver(post_save, sender=LeaveRequest)
+def publish_leave_request_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    leave_request_events.publish(
+        [
+            {
+                "event": "created" if created else "updated",
+                "uuid": instance.uuid,
+                "status": instance.status,
+            }
+        ]
+    )
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def publish_leave_request_delete(sender, instance, **kwargs):
+    leave_request_events.publish(
+        [{"event": "deleted", "uuid": instance.uuid, "status": instance.status}]
+    )
+
+
+@receiver(pre_save, sender=Employee)
+def remember_previous_balance(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_balance = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "available_paid_leaves" not in update_fields:
+        return
+    employees = Employee.objects.filter(pk=instance.pk)
+    if connection.in_atomic_block:
+        # Hold the row until commit so no debit slips in between
+        employees = employees.select_for_update()
+    instance._previous_balance = employees.values_list(
+        "available_paid_leaves", flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Employee)
+def record_balance_adjustment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        previous = 0
+    else:
+        previous = getattr(instance, "_previous_balance", None)
+    if previous is None or previous == instance.available_paid_leaves:
+        return
+    record_entry(
+        instance.pk,
+        LeaveLedgerEntry.Kind.ADJUSTMENT,
+        instance.available_paid_leaves - previous,
+        note="Opening balance" if created else None,
+    )
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_tokens_on_save(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    if raw or created:
+        return
+    # Cached users must not outlive a password change, demotion or
+    # deactivation
+    if update_fields is None or {*SNAPSHOT_FIELDS, "password"} & set(update_fields):
+        invalidate_cached_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def invalidate_tokens_on_employee_delete(sender, instance, **kwargs):
+    invalidate_cached_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_tokens_on_token_delete(sender, instance, **kwargs):
+    invalidate_cached_tokens(instance.user_id)
+
+
+@receiver(pre_save, sender=Employee)
+def remember_previous_credentials(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_credentials = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(CREDENTIAL_FIELDS) & set(update_fields):
+        return
+    instance._previous_credentials = (
+        Employee.objects.filter(pk=instance.pk).values_list(*CREDENTIAL_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Employee)
+def revoke_tokens_on_credentials_change(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_previous_credentials", None)
+    if raw or created or previous is None:
+        return
+    if previous != tuple(getattr(instance, field) for field in CREDENTIAL_FIELDS):
+        revoke_employee_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def revoke_tokens_on_employee_delete(sender, instance, **kwargs):
+    revoke_deleted_employee_tokens(instance.pk)
@@ -0,0 +1,202 @@
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+
+from .events import auth_events
+from .models import TokenRevocation
+
+# Lifetimes in seconds
+ACCESS_TOKEN_LIFETIME = getattr(settings, "ACCESS_TOKEN_LIFETIME", 5 * 60)
+REFRESH_TOKEN_LIFETIME = getattr(settings, "REFRESH_TOKEN_LIFETIME", 7 * 24 * 60 * 60)
+# Distinct salts keep a refresh token from being accepted as an access
+# token and vice versa
+ACCESS_SALT = "rest_api.tokens.access"
+REFRESH_SALT = "rest_api.tokens.refresh"
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _to_ms(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def _from_ms(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=dt_timezone.utc)
+
+
+def _sign(employee, salt):
+    claims = {
+        "sub": employee.pk,
+        "eid": employee.employee_id,
+        "typ": employee.employee_type,
+        "iat": _now_ms(),
+        "jti": secrets.token_urlsafe(12),
+    }
+    return signing.dumps(claims, salt=salt)
+
+
+def issue_access_token(employee):
+    return {
+        "access": _sign(employee, ACCESS_SALT),
+        "token_type": "Bearer",
+        "expires_in": ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def issue_tokens(employee):
+    return {
+        **issue_access_token(employee),
+        "refresh": _sign(employee, REFRESH_SALT),
+        "refresh_expires_in": REFRESH_TOKEN_LIFETIME,
+    }
+
+
+def _read(token, salt, lifetime):
+    try:
+        claims = signing.loads(token, salt=salt, max_age=lifetime)
+    except signing.SignatureExpired:
+        raise InvalidToken("Token has expired")
+    except signing.BadSignature:
+        raise InvalidToken("Invalid token")
+    if revocations.is_revoked(claims):
+        raise InvalidToken("Token has been revoked")
+    return claims
+
+
+def read_access_token(token):
+    """
+    Return the claims of a valid access token, checked against the
+    signature and the in-memory revocation list only.
+    """
+    return _read(token, ACCESS_SALT, ACCESS_TOKEN_LIFETIME)
+
+
+def read_refresh_token(token):
+    return _read(token, REFRESH_SALT, REFRESH_TOKEN_LIFETIME)
+
+
+class RevocationList:
+    """
+    This process's copy of the unexpired revocations: single tokens by
+    ``jti``, and per employee the time before which all their tokens are
+    revoked. It is loaded from ``TokenRevocation`` on first use and kept
+    current through ``auth_events``.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        # jti -> expiry, and employee pk -> (revoked at, expiry), in epoch ms
+        self.tokens = {}
+        self.employees = {}
+
+    def add(self, employee_pk, revoked, expires, jti=None):
+        with self.lock:
+            if jti:
+                self.tokens[jti] = expires
+            else:
+                previous = self.employees.get(employee_pk)
+                if previous is None or previous[0] < revoked:
+                    self.employees[employee_pk] = (revoked, expires)
+            self._prune(_now_ms())
+
+    def _prune(self, now):
+        self.tokens = {
+            jti: expires for jti, expires in self.tokens.items() if expires > now
+        }
+        self.employees = {
+            pk: entry for pk, entry in self.employees.items() if entry[1] > now
+        }
+
+    def load(self):
+        rows = TokenRevocation.objects.filter(
+            expires_at__gt=timezone.now()
+        ).values_list("employee_id", "revoked_at", "expires_at", "jti")
+        for employee_pk, revoked_at, expires_at, jti in rows:
+            self.add(employee_pk, _to_ms(revoked_at), _to_ms(expires_at), jti)
+        self.loaded = True
+
+    def reset(self):
+        # Notifications may have been missed, so reload on next use
+        self.loaded = False
+
+    def is_revoked(self, claims):
+        if not self.loaded:
+            self.load()
+        with self.lock:
+            if claims["jti"] in self.tokens:
+                return True
+            revoked = self.employees.get(claims["sub"])
+            return revoked is not None and claims["iat"] <= revoked[0]
+
+
+revocations = RevocationList()
+
+
+def _revoke(employee_pk, expires_at, jti=None):
+    revoked_at = timezone.now()
+    TokenRevocation.objects.filter(expires_at__lte=revoked_at).delete()
+    TokenRevocation.objects.create(
+        employee_id=employee_pk, jti=jti, revoked_at=revoked_at, expires_at=expires_at
+    )
+    publish_revocation(employee_pk, _to_ms(revoked_at), _to_ms(expires_at), jti)
+
+
+def publish_revocation(employee_pk, revoked, expires, jti=None):
+    """
+    Add a revocation to every process's list once the current transaction
+    commits.
+    """
+    transaction.on_commit(lambda: revocations.add(employee_pk, revoked, expires, jti))
+    auth_events.publish(
+        [
+            {
+                "event": "revoke",
+                "user": employee_pk,
+                "revoked": revoked,
+                "expires": expires,
+                "jti": jti,
+            }
+        ]
+    )
+
+
+def revoke_token(claims, refresh=False):
+    """
+    Revoke one token, given its claims, until it would have expired.
+    """
+    lifetime = REFRESH_TOKEN_LIFETIME if refresh else ACCESS_TOKEN_LIFETIME
+    _revoke(
+        claims["sub"],
+        _from_ms(claims["iat"]) + timedelta(seconds=lifetime),
+        claims["jti"],
+    )
+
+
+def revoke_employee_tokens(employee_pk):
+    """
+    Revoke every token issued to the employee so far.
+    """
+    _revoke(employee_pk, timezone.now() + timedelta(seconds=REFRESH_TOKEN_LIFETIME))
+
+
+def revoke_deleted_employee_tokens(employee_pk):
+    """
+    Stop a deleted employee's live access tokens. Nothing is stored, as
+    their revocation rows go with them and refreshing needs the employee.
+    """
+    now = _now_ms()
+    publish_revocation(employee_pk, now, now + ACCESS_TOKEN_LIFETIME * 1000)
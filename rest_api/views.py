@@ -1,5 +1,8 @@
+from datetime import datetime
 from time import strptime
 
+from django.conf import settings
+from django.db import connections, transaction
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
@@ -8,20 +11,72 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.decorators import action
 from rest_framework.exceptions import (
     NotFound,
-    PermissionDenied,
     ValidationError,
 )
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from .authentication import token_cache
+from .conditional import ConditionalGetMixin
+from .events import EventStreamRenderer, event_stream_response, leave_request_events
+from .exports import export_response
+from .fieldsets import SparseFieldsetMixin
 from .filters import AttendanceFilter, EmployeeFilter, LeaveRequestFilter
+from .heatmaps import heatmap_legend, yearly_heatmaps
+from .imports import ImportFormatError, import_employees, read_rows
+from .leaves import (
+    APPROVE,
+    DECISIONS,
+    DENY,
+    LeaveDecisionError,
+    decide_leave_request,
+    decide_leave_requests,
+)
+from .ledger import balance_as_of
 from .models import Attendance, Employee, LeaveRequest
-from .permissions import IsPrivileged
+from .pagination import KeysetPagination, QueuePagination
+from .permissions import IsOwner, IsPrivileged, OwnerScopedMixin
+from .reports import (
+    annotate_monthly_counts,
+    month_range,
+    month_report,
+    monthly_summary,
+    previous_month_range,
+    range_reports,
+    report_sources,
+)
+from .rollups import refresh_attendance_months
 from .serializers import (
     AttendanceSerializer,
     EmployeeAuthTokenSerializer,
     EmployeeSerializer,
+    LeaveLedgerEntrySerializer,
     LeaveRequestSerializer,
 )
+from .tokens import (
+    InvalidToken,
+    issue_access_token,
+    issue_tokens,
+    read_refresh_token,
+    revoke_employee_tokens,
+    revoke_token,
+)
+
+BULK_ATTENDANCE_MAX_ROWS = 20000
+BULK_ATTENDANCE_BATCH_SIZE = 1000
+# Rows another request inserted since the duplicate check are left out of
+# RETURNING and reported as duplicates
+BULK_ATTENDANCE_INSERT_SQL = f"""
+    INSERT INTO {Attendance._meta.db_table} (employee_id, date, status, updated_at)
+    VALUES {{values}}
+    ON CONFLICT (employee_id, date) DO NOTHING
+    RETURNING employee_id, date
+"""
+ATTENDANCE_RANGE_MAX_DAYS = 732
+BULK_DECISION_MAX_REQUESTS = 1000
+EMPLOYEE_IMPORT_MAX_ROWS = 10000
 
 
 class LoginView(ObtainAuthToken):
@@ -33,37 +88,117 @@ class LoginView(ObtainAuthToken):
         )
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
+        if settings.AUTH_TOKEN_MODE == "signed":
+            return Response({**issue_tokens(user), "employee_id": user.employee_id})
         token, created = Token.objects.get_or_create(user=user)
         return Response({"token": token.key, "employee_id": user.employee_id})
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.all().order_by("employee_id")
-    serializer_class = EmployeeSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    lookup_field = "employee_id"
+class RefreshTokenView(APIView):
+    """
+    Exchanges a refresh token for a new signed access token, re-reading the
+    employee so a deactivation or type change takes effect.
+    """
 
-    filter_backends = [DjangoFilterBackend]
-    filterset_class = EmployeeFilter
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        employee_id = self.kwargs.get("employee_id")
+    def post(self, request):
+        if settings.AUTH_TOKEN_MODE != "signed":
+            return Response(
+                "Signed tokens are not enabled", status=status.HTTP_404_NOT_FOUND
+            )
+        refresh = request.data.get("refresh")
+        if not isinstance(refresh, str):
+            return Response(
+                "A refresh token must be provided",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            claims = read_refresh_token(refresh)
+        except InvalidToken as error:
+            return Response(str(error), status=status.HTTP_401_UNAUTHORIZED)
+
+        employee = (
+            Employee.objects.filter(pk=claims["sub"], is_active=True)
+            .only("employee_id", "employee_type")
+            .first()
+        )
+        if employee is None:
+            return Response("Invalid token", status=status.HTTP_401_UNAUTHORIZED)
+        return Response(issue_access_token(employee))
 
-        if self.request.user.employee_type == "PRIVILEGED" and employee_id:  # pyright: ignore
-            return queryset.filter(employee_id=employee_id)
 
-        if (
-            self.request.user.employee_type == "GENERAL"  # pyright: ignore
-            and employee_id
-            and employee_id != self.request.user.employee_id  # pyright: ignore
-        ):
-            raise PermissionDenied("You are not authorized to access this resource")
+class RevokeTokenView(APIView):
+    """
+    Logs out of signed tokens: revokes the given refresh token and the
+    access token the request is made with, or with ``"all": true`` every
+    token issued to their employee.
+    """
 
-        if self.request.user.employee_type == "GENERAL":  # pyright: ignore
-            return queryset.filter(id=self.request.user.id)  # pyright: ignore
+    permission_classes = [permissions.AllowAny]
 
-        return queryset
+    def post(self, request):
+        claims = []
+        refresh = request.data.get("refresh")
+        if refresh is not None:
+            if not isinstance(refresh, str):
+                return Response(
+                    "Refresh token must be a string",
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                claims.append((read_refresh_token(refresh), True))
+            except InvalidToken as error:
+                return Response(str(error), status=status.HTTP_401_UNAUTHORIZED)
+        if isinstance(request.auth, dict):
+            claims.append((request.auth, False))
+        if not claims:
+            return Response(
+                "A refresh or access token must be provided",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            if request.data.get("all") is True:
+                for employee_pk in {token["sub"] for token, _ in claims}:
+                    revoke_employee_tokens(employee_pk)
+            else:
+                for token, refresh in claims:
+                    revoke_token(token, refresh=refresh)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class StatsView(APIView):
+    """
+    Per-worker runtime statistics, for privileged users.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsPrivileged]
+
+    def get(self, request):
+        pool = getattr(connections["default"], "pool", None)
+        return Response(
+            {
+                "token_cache": token_cache.stats(),
+                "database_pool": pool.get_stats() if pool else None,
+            }
+        )
+
+
+class EmployeeViewSet(
+    ConditionalGetMixin, OwnerScopedMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
+    queryset = Employee.objects.all().order_by("employee_id")
+    serializer_class = EmployeeSerializer
+    permission_classes = [permissions.IsAuthenticated, IsPrivileged | IsOwner]
+    lookup_field = "employee_id"
+    owner_field = "pk"
+    pagination_class = KeysetPagination
+    keyset_ordering = ("employee_id",)
+
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = EmployeeFilter
 
     def create(self, request, *args, **kwargs):
         if request.user.employee_type != "PRIVILEGED":  # pyright: ignore
@@ -102,38 +237,110 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
         return super().destroy(request, args, kwargs)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+        url_path="import",
+    )
+    def bulk_import(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            format = request.data.get("format") or upload.name.rpartition(".")[2]
+            try:
+                rows = read_rows(upload.read(), format.lower())
+            except ImportFormatError as error:
+                raise ValidationError(str(error))
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                raise ValidationError(
+                    "A list of employees or a CSV/JSON file must be provided"
+                )
+        if len(rows) > EMPLOYEE_IMPORT_MAX_ROWS:
+            raise ValidationError(
+                f"At most {EMPLOYEE_IMPORT_MAX_ROWS} employees can be imported at once"
+            )
+
+        dry_run = request.query_params.get("dry_run") in ("1", "true")
+        result = import_employees(rows, dry_run=dry_run)
+
+        if not result["valid"]:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif dry_run:
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(result, status=response_status)
+
+    @action(detail=True, methods=["get"])
+    def ledger(self, request, *args, **kwargs):
+        employee = self.get_object()
+        entries = employee.leave_ledger.order_by("-date", "-id")
+
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        serializer = LeaveLedgerEntrySerializer(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def balance(self, request, *args, **kwargs):
+        employee = self.get_object()
+        as_of = request.query_params.get("as_of")
+        if not as_of:
+            return Response(
+                {
+                    "employee_id": employee.employee_id,
+                    "as_of": None,
+                    "balance": employee.available_paid_leaves,
+                }
+            )
+
+        try:
+            as_of = datetime.strptime(as_of, "%Y-%m-%d").date()
+        except ValueError:
+            return Response(
+                "as_of must be in YYYY-MM-DD format",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "employee_id": employee.employee_id,
+                "as_of": as_of,
+                "balance": balance_as_of(employee.pk, as_of),
+            }
+        )
+
 
-class MonthlyAttendanceViewSet(viewsets.ModelViewSet):
+class MonthlyAttendanceViewSet(
+    ConditionalGetMixin, OwnerScopedMixin, viewsets.ModelViewSet
+):
     queryset = Attendance.objects.all()
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        employee_id = self.kwargs.get("employee_id")
-
-        if self.request.user.employee_type == "GENERAL":  # pyright: ignore
-            if employee_id and employee_id != self.request.user.employee_id:  # pyright: ignore
-                raise PermissionDenied("You are unauthorized to access this resource")
-            queryset = queryset.filter(employee=self.request.user)
-
-        if not employee_id:
-            employee_id = self.request.user.employee_id
+        employee_id = self.requested_employee_id() or self.request.user.employee_id  # pyright: ignore
+        return super().get_queryset().filter(employee__employee_id=employee_id)
+
+    def report_not_modified(self, request, employees, start_date, end_date):
+        """
+        Answer a conditional GET for a report on ``employees``' attendance
+        between the two dates.
+        """
+        from django.utils import timezone
 
-        queryset = queryset.filter(employee__employee_id=employee_id)
-        return queryset
+        # Days up to today count as absent, so reports also change daily
+        return self.not_modified(
+            request,
+            *report_sources(employees, start_date, end_date),
+            extra=[timezone.localdate()],
+        )
 
     def list(self, request, *args, **kwargs):
-        employee_id = self.kwargs.get("employee_id")
-
-        if self.request.user.employee_type == "GENERAL":  # pyright: ignore
-            if employee_id and employee_id != self.request.user.employee_id:  # pyright: ignore
-                raise PermissionDenied("You are unauthorized to access this resource")
-
-        if not employee_id:
-            employee_id = self.request.user.employee_id
-
-        employee = Employee.objects.get(employee_id=employee_id)
+        employee_id = self.requested_employee_id() or request.user.employee_id  # pyright: ignore
 
         month = self.kwargs.get("month")
         if not month:
@@ -141,11 +348,11 @@ class MonthlyAttendanceViewSet(viewsets.ModelViewSet):
                 "A month must be provided", status=status.HTTP_400_BAD_REQUEST
             )
 
-        from datetime import datetime, timedelta
+        from datetime import datetime
 
         from django.utils import timezone
 
-        today = timezone.now().date()
+        today = timezone.localdate()
         try:
             start_date = datetime.strptime(month + "-01", "%Y-%m-%d").date()
         except Exception:
@@ -158,73 +365,168 @@ class MonthlyAttendanceViewSet(viewsets.ModelViewSet):
         _, num_days = calendar.monthrange(start_date.year, start_date.month)
         end_date = start_date.replace(day=num_days)
 
-        prev_end_date = start_date.replace(day=1) - timedelta(days=1)
-        prev_start_date = prev_end_date.replace(day=1)
-
-        # 2. Get actual DB entries
+        not_modified = self.report_not_modified(
+            request,
+            Employee.objects.filter(employee_id=employee_id),
+            previous_month_range(start_date)[0],
+            end_date,
+        )
+        if not_modified:
+            return not_modified
+
+        # 1. Last month's counts come from the monthly rollup
+        employee = annotate_monthly_counts(
+            Employee.objects.filter(employee_id=employee_id),
+            start_date,
+            end_date,
+            today,
+        ).first()
+        if employee is None:
+            raise NotFound(f"Employee with ID '{employee_id}' not found")
+
+        # 2. Get actual DB entries and fill the gaps
         logs = self.get_queryset().filter(
             date__range=[start_date, end_date],
         )
-        prev_logs = self.get_queryset().filter(
-            date__range=[prev_start_date, prev_end_date]
+        return Response(month_report(employee, logs, start_date, end_date, today))
+
+    def summary(self, request, *args, **kwargs):
+        month = self.kwargs.get("month")
+        try:
+            start_date = datetime.strptime(month + "-01", "%Y-%m-%d").date()
+        except Exception:
+            return Response(
+                "Month must be in YYYY-MM format", status=status.HTTP_400_BAD_REQUEST
+            )
+        start_date, end_date = month_range(start_date)
+
+        from django.utils import timezone
+
+        today = timezone.localdate()
+
+        employees = self.scope_employees(
+            Employee.objects.order_by("employee_id").only(
+                "employee_id", "date_joined", "available_paid_leaves"
+            )
         )
-        # Convert to a dictionary for fast lookup: { date_obj: log_obj }
-        logs_dict = {log.date: log for log in logs}
-        prev_logs_dict = {log.date: log for log in prev_logs}
-
-        # 3. Generate the full list (The "Gap Filling")
-        full_report = {
-            "employee_id": employee_id,
-            "absent_this_month": 0,
-            "absent_last_month": 0,
-            "available_paid_leaves": employee.available_paid_leaves,
-            "logs": [],
-        }
-
-        current_check = start_date
-        while current_check <= end_date:
-            if current_check < employee.date_joined.date() or current_check > today:
-                current_check += timedelta(days=1)
-                continue
-            if current_check in logs_dict:
-                entry = logs_dict[current_check]
-                full_report["logs"].append(
-                    {
-                        "date": current_check,
-                        "day": calendar.day_name[current_check.weekday()],
-                        "status": entry.status,  # e.g., 'Present', 'Late'
-                    }
-                )
-            else:
-                full_report["absent_this_month"] += 1
-                full_report["logs"].append(
-                    {
-                        "date": current_check,
-                        "day": calendar.day_name[current_check.weekday()],
-                        "status": "ABSENT",
-                    }
-                )
+        not_modified = self.report_not_modified(
+            request, employees, previous_month_range(start_date)[0], end_date
+        )
+        if not_modified:
+            return not_modified
+        employees = annotate_monthly_counts(employees, start_date, end_date, today)
+
+        page = self.paginate_queryset(employees)
+        rows = [
+            monthly_summary(employee, start_date, end_date, today)
+            for employee in (page if page is not None else employees)
+        ]
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    def date_range(self, request, *args, **kwargs):
+        try:
+            start_date = datetime.strptime(
+                request.query_params.get("from", ""), "%Y-%m-%d"
+            ).date()
+            end_date = datetime.strptime(
+                request.query_params.get("to", ""), "%Y-%m-%d"
+            ).date()
+        except ValueError:
+            return Response(
+                "'from' and 'to' must be provided in YYYY-MM-DD format",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end_date < start_date:
+            return Response(
+                "'to' must not be before 'from'", status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end_date - start_date).days >= ATTENDANCE_RANGE_MAX_DAYS:
+            return Response(
+                f"Date range cannot exceed {ATTENDANCE_RANGE_MAX_DAYS} days",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            current_check += timedelta(days=1)
+        employee_ids = [
+            employee_id
+            for value in request.query_params.getlist("employee_id")
+            for employee_id in value.split(",")
+            if employee_id
+        ]
 
-        current_check = prev_start_date
-        while current_check <= prev_end_date:
-            if current_check < employee.date_joined.date() or current_check > today:
-                current_check += timedelta(days=1)
-                continue
-            if current_check not in prev_logs_dict:
-                full_report["absent_last_month"] += 1
+        employees = Employee.objects.order_by("employee_id").only(
+            "employee_id", "date_joined"
+        )
+        employees = self.scope_employees(employees, employee_ids)
+        not_modified = self.report_not_modified(
+            request, employees, start_date, end_date
+        )
+        if not_modified:
+            return not_modified
 
-            current_check += timedelta(days=1)
+        from django.utils import timezone
 
-        return Response(full_report)
+        page = self.paginate_queryset(employees)
+        rows = range_reports(
+            page if page is not None else employees,
+            start_date,
+            end_date,
+            timezone.localdate(),
+            include_logs=request.query_params.get("summary") not in ("1", "true"),
+        )
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    def heatmap(self, request, *args, **kwargs):
+        year = self.kwargs.get("year")
+        if not 1 <= year <= 9999:
+            return Response("Invalid year", status=status.HTTP_400_BAD_REQUEST)
+        employee_ids = [
+            employee_id
+            for value in request.query_params.getlist("employee_id")
+            for employee_id in value.split(",")
+            if employee_id
+        ]
+
+        employees = Employee.objects.order_by("employee_id")
+        employees = self.scope_employees(employees, employee_ids)
+        not_modified = self.report_not_modified(
+            request,
+            employees,
+            datetime(year, 1, 1).date(),
+            datetime(year, 12, 31).date(),
+        )
+        if not_modified:
+            return not_modified
+
+        employees = list(employees.values_list("id", "employee_id"))
+        heatmaps = yearly_heatmaps([pk for pk, _ in employees], year)
+
+        return Response(
+            {
+                "year": year,
+                "legend": heatmap_legend(),
+                "results": [
+                    {"employee_id": employee_id, "days": heatmaps[pk]}
+                    for pk, employee_id in employees
+                ],
+            }
+        )
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(
+    ConditionalGetMixin, OwnerScopedMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
     queryset = Attendance.objects.all().order_by("date")
     serializer_class = AttendanceSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsPrivileged | IsOwner]
     filterset_class = AttendanceFilter
+    pagination_class = KeysetPagination
+    keyset_ordering = ("date", "id")
+    # Rows render their employee's employee_id
+    stamp_related = ("employee",)
 
     def get_object(self):
         date = self.kwargs.get("date")
@@ -242,12 +544,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         date_str = self.kwargs.get("date")
-        employee_id = self.kwargs.get("employee_id")
-
-        if self.request.user.employee_type == "GENERAL":  # pyright: ignore
-            if employee_id and employee_id != self.request.user.employee_id:  # pyright: ignore
-                raise PermissionDenied("You are unauthorized to access this resource")
-            queryset = queryset.filter(employee=self.request.user)
+        employee_id = self.requested_employee_id()
 
         if employee_id:
             queryset = queryset.filter(employee__employee_id=employee_id)
@@ -288,6 +585,164 @@ class AttendanceViewSet(viewsets.ModelViewSet):
 
         return super().create(request, args, kwargs)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+    )
+    def bulk(self, request, *args, **kwargs):
+        from django.utils import timezone
+
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError("A list of attendance entries must be provided")
+        if len(rows) > BULK_ATTENDANCE_MAX_ROWS:
+            raise ValidationError(
+                f"At most {BULK_ATTENDANCE_MAX_ROWS} entries can be submitted at once"
+            )
+
+        valid_statuses = set(Attendance.Status.values)
+        results = []
+        parsed = {}
+
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                row = {}
+            employee_id = row.get("employee_id")
+            results.append(
+                {
+                    "index": index,
+                    "employee_id": employee_id,
+                    "date": row.get("date"),
+                    "status": "created",
+                    "error": None,
+                }
+            )
+            if not employee_id:
+                results[index].update(
+                    status="error", error="Employee ID must be provided"
+                )
+                continue
+            try:
+                date = datetime.strptime(str(row.get("date")), "%Y-%m-%d").date()
+            except ValueError:
+                results[index].update(
+                    status="error", error="Date must be in YYYY-MM-DD format"
+                )
+                continue
+            attendance_status = row.get("status")
+            if (
+                not isinstance(attendance_status, str)
+                or attendance_status not in valid_statuses
+            ):
+                results[index].update(status="error", error="Invalid status")
+                continue
+            parsed[index] = (str(employee_id), date, row["status"])
+
+        # One query resolves every employee referenced by the batch
+        employee_pks = dict(
+            Employee.objects.filter(
+                employee_id__in={employee_id for employee_id, _, _ in parsed.values()}
+            ).values_list("employee_id", "id")
+        )
+
+        for index, (employee_id, date, _) in list(parsed.items()):
+            if employee_id not in employee_pks:
+                results[index].update(
+                    status="error",
+                    error=f"Employee with ID '{employee_id}' not found",
+                )
+                del parsed[index]
+            elif employee_pks[employee_id] == request.user.id:  # pyright: ignore
+                results[index].update(
+                    status="error",
+                    error="You cannot record your own attendance",
+                )
+                del parsed[index]
+
+        # One query finds every (employee, date) pair that is already taken
+        existing = set(
+            Attendance.objects.filter(
+                employee_id__in={employee_pks[e] for e, _, _ in parsed.values()},
+                date__in={date for _, date, _ in parsed.values()},
+            ).values_list("employee_id", "date")
+        )
+
+        to_create = {}
+        for index, (employee_id, date, attendance_status) in parsed.items():
+            key = (employee_pks[employee_id], date)
+            if key in existing:
+                results[index].update(
+                    status="error",
+                    error="Duplicate attendance entries cannot exist",
+                )
+                continue
+            existing.add(key)
+            to_create[index] = (*key, attendance_status)
+
+        connection = connections["default"]
+        updated_at = connection.ops.adapt_datetimefield_value(timezone.now())
+        to_date = Attendance._meta.get_field("date").to_python
+        rows_to_create = list(to_create.values())
+        created = set()
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(rows_to_create), BULK_ATTENDANCE_BATCH_SIZE):
+                batch = rows_to_create[start : start + BULK_ATTENDANCE_BATCH_SIZE]
+                cursor.execute(
+                    BULK_ATTENDANCE_INSERT_SQL.format(
+                        values=", ".join(["(%s, %s, %s, %s)"] * len(batch))
+                    ),
+                    [
+                        value
+                        for employee_pk, date, attendance_status in batch
+                        for value in (
+                            employee_pk,
+                            connection.ops.adapt_datefield_value(date),
+                            attendance_status,
+                            updated_at,
+                        )
+                    ],
+                )
+                created.update(
+                    (employee_pk, to_date(date))
+                    for employee_pk, date in cursor.fetchall()
+                )
+            # The raw INSERT bypasses the signals that keep rollups current
+            refresh_attendance_months(created)
+
+        for index, (employee_pk, date, _) in to_create.items():
+            if (employee_pk, date) not in created:
+                results[index].update(
+                    status="error",
+                    error="Duplicate attendance entries cannot exist",
+                )
+
+        response_status = status.HTTP_201_CREATED
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {
+                "created": len(created),
+                "failed": len(rows) - len(created),
+                "results": results,
+            },
+            status=response_status,
+        )
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        return export_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            {
+                "date": "date",
+                "employee_id": "employee__employee_id",
+                "status": "status",
+            },
+            "attendances",
+        )
+
     def partial_update(self, request, *args, **kwargs):
         if request.user.employee_type != "PRIVILEGED":  # pyright: ignore
             return Response(status=status.HTTP_401_UNAUTHORIZED)
@@ -301,29 +756,18 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         return super().destroy(request, args, kwargs)
 
 
-class LeaveRequestViewSet(viewsets.ModelViewSet):
+class LeaveRequestViewSet(
+    ConditionalGetMixin, OwnerScopedMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
     queryset = LeaveRequest.objects.all().order_by("date")
     serializer_class = LeaveRequestSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsPrivileged | IsOwner]
     lookup_field = "uuid"
     filterset_class = LeaveRequestFilter
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        uuid = self.kwargs.get("uuid")
-
-        if self.request.user.employee_type == "GENERAL":  # pyright: ignore
-            if (
-                uuid
-                and LeaveRequest.objects.get(uuid=uuid).employee.employee_id
-                != self.request.user.employee_id  # pyright: ignore
-            ):
-                raise PermissionDenied("You are not authorized to access this resource")
-
-        if uuid:  # pyright: ignore
-            queryset = queryset.filter(uuid=uuid)
-
-        return queryset
+    pagination_class = KeysetPagination
+    keyset_ordering = ("date", "uuid")
+    # Rows nest their employee and processor
+    stamp_related = ("employee", "processor")
 
     def create(self, request, *args, **kwargs):
         if request.user.available_paid_leaves > 0:  # pyright: ignore
@@ -342,6 +786,26 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(employee=self.request.user)
 
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        return export_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            {
+                "uuid": "uuid",
+                "created_at": "created_at",
+                "employee_id": "employee__employee_id",
+                "date": "date",
+                "end_date": "end_date",
+                "days": "days",
+                "message": "message",
+                "status": "status",
+                "processor": "processor__employee_id",
+                "response_message": "response_message",
+            },
+            "leave-requests",
+        )
+
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
 
@@ -354,49 +818,94 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
 
         return super().update(request, args, kwargs)
 
-    @action(detail=True, methods=["post"], permission_classes=[IsPrivileged])
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+    )
+    def queue(self, request, *args, **kwargs):
+        """
+        Pending leave requests, oldest date first, read from the partial
+        index on pending requests and paginated by cursor without a count.
+        """
+        queryset = self.get_queryset().filter(
+            status=LeaveRequest.ApprovalStatus.PENDING
+        )
+        paginator = QueuePagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    def queue_events(self, request, *args, **kwargs):
+        """
+        Server-Sent Events for leave requests being created, decided,
+        changed or deleted, so queue dashboards don't have to poll.
+        """
+        return event_stream_response(request, leave_request_events)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+    )
+    def bulk_decision(self, request, *args, **kwargs):
+        uuids = request.data.get("uuids")
+        decision = request.data.get("decision")
+
+        if not isinstance(uuids, list) or not uuids:
+            raise ValidationError("A list of leave request uuids must be provided")
+        if len(uuids) > BULK_DECISION_MAX_REQUESTS:
+            raise ValidationError(
+                f"At most {BULK_DECISION_MAX_REQUESTS} leave requests can be "
+                "processed at once"
+            )
+        try:
+            uuids = [int(uuid) for uuid in uuids]
+        except (TypeError, ValueError):
+            raise ValidationError("Leave request uuids must be integers")
+        if decision not in DECISIONS:
+            raise ValidationError("Decision must be one of: " + ", ".join(DECISIONS))
+
+        results = decide_leave_requests(
+            request.user, uuids, decision, request.data.get("response_message")
+        )
+        return Response({"results": results})
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+    )
     def approve(self, request, *args, **kwargs):
         leave_request = self.get_object()
-        if leave_request.employee == request.user:
-            return Response(
-                "You cannot approve your own leave request",
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        if leave_request.status == LeaveRequest.ApprovalStatus.PENDING:
-            leave_request.status = LeaveRequest.ApprovalStatus.APPROVED
-            leave_request.processor = request.user
-            leave_request.response_message = request.data.get("response_message")
-            leave_request.employee.available_paid_leaves -= 1
-            leave_request.employee.save()
-            leave_request.save()
-            Attendance.objects.create(
-                employee=leave_request.employee,
-                date=leave_request.date,
-                status="ON_LEAVE",
-            )
-            return Response("Leave request approved")
-        else:
-            return Response(
-                "Leave request is not in PENDING state",
-                status=status.HTTP_400_BAD_REQUEST,
+        try:
+            decide_leave_request(
+                leave_request,
+                request.user,
+                APPROVE,
+                request.data.get("response_message"),
             )
-
-    @action(detail=True, methods=["post"], permission_classes=[IsPrivileged])
+        except LeaveDecisionError as error:
+            return Response(str(error), status=status.HTTP_400_BAD_REQUEST)
+        return Response("Leave request approved")
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsPrivileged],
+    )
     def deny(self, request, *args, **kwargs):
         leave_request = self.get_object()
-        if leave_request.employee == request.user:
-            return Response(
-                "You cannot deny your own leave request",
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        if leave_request.status == LeaveRequest.ApprovalStatus.PENDING:
-            leave_request.status = LeaveRequest.ApprovalStatus.DENIED
-            leave_request.processor = request.user
-            leave_request.response_message = request.data.get("response_message")
-            leave_request.save()
-            return Response("Leave request denied")
-        else:
-            return Response(
-                "Leave request is not in PENDING state",
-                status=status.HTTP_400_BAD_REQUEST,
+        try:
+            decide_leave_request(
+                leave_request, request.user, DENY, request.data.get("response_message")
             )
+        except LeaveDecisionError as error:
+            return Response(str(error), status=status.HTTP_400_BAD_REQUEST)
+        return Response("Leave request denied")